@@ -1,15 +1,43 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 import random
 import requests
 import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple, Union
 import time
+import threading
+import contextvars
+import functools
+import importlib.util
+import io
+import multiprocessing
+import os
+import bisect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from itertools import repeat
 from streamlit_extras.metric_cards import style_metric_cards
 import base64
+import hashlib
+import cProfile
+import hmac
+import pstats
+import tempfile
+import tracemalloc
+from array import array
+from contextlib import contextmanager
+import epic_frames
+
+try:
+    import ijson
+except ImportError:  # Optional: falls back to parsing whole responses
+    ijson = None
 
 # Page configuration
 st.set_page_config(
@@ -22,200 +50,473 @@ st.set_page_config(
 # ---------------------------
 # CUSTOM SCI-FI THEME STYLING
 # ---------------------------
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+THEME_STYLESHEET = "theme.css"
+# (family, weight range, file in static/fonts, Google Fonts spec). Fonts are
+# self-hosted so the page makes no third-party requests and works air-gapped.
+THEME_FONTS = [
+    ("Orbitron", "400 900", "Orbitron-Variable.woff2", "Orbitron:wght@400;700;900"),
+    ("Exo 2", "300 600", "Exo2-Variable.woff2", "Exo+2:wght@300;400;600"),
+]
+# Opt-in: load fonts missing from static/fonts from Google Fonts instead
+THEME_GOOGLE_FONTS = os.environ.get("DASHBOARD_GOOGLE_FONTS") == "1"
+
+# Sent inline until the loader reports the full stylesheet is in the page, so
+# even the first paint has the theme's fonts and background
+THEME_CRITICAL_CSS = """
+.stApp {
+    background: radial-gradient(circle at 20% 20%, #0a0a2a 0%, #000010 100%);
+    background-attachment: fixed;
+}
+h1, h2, h3 {
+    font-family: 'Orbitron', sans-serif !important;
+    color: #00e6ff !important;
+    text-shadow: 0 0 10px #00e6ff, 0 0 20px #00a2ff;
+}
+"""
+
+# Adds the fonts, stylesheet and header clock to the page <head>, where they
+# outlive the component and every later rerun, then reports back
+_theme_loader = components.declare_component(
+    "theme_loader", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "components", "theme_loader")
+)
+
+def theme_asset_version() -> str:
+    """Content hash of the theme assets.
+
+    Static URLs carrying a ``v`` query argument are served with a ten-year
+    max-age, so bumping the hash is what invalidates browser caches.
+    """
+    digest = hashlib.sha256()
+    paths = [os.path.join(STATIC_DIR, THEME_STYLESHEET)]
+    paths += [os.path.join(STATIC_DIR, "fonts", file) for _, _, file, _ in THEME_FONTS]
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+def theme_font_faces(version: str) -> str:
+    """@font-face rules preferring installed copies, then the files in static/fonts.
+
+    A font whose file is missing falls back to an installed copy only, or with
+    THEME_GOOGLE_FONTS to Google Fonts.
+    """
+    imports, faces = [], []
+    for family, weights, file, spec in THEME_FONTS:
+        src = f"local('{family}')"
+        if os.path.exists(os.path.join(STATIC_DIR, "fonts", file)):
+            src += f", url('app/static/fonts/{file}?v={version}') format('woff2')"
+        elif THEME_GOOGLE_FONTS:
+            imports.append(spec)
+            continue
+        faces.append(
+            f"@font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weights}; "
+            f"font-display: swap; src: {src}; }}"
+        )
+    if imports:  # @import must precede every other rule
+        faces.insert(0, f"@import url('https://fonts.googleapis.com/css2?family={'&family='.join(imports)}&display=swap');")
+    return "\n".join(faces)
+
 def apply_custom_theme():
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;700;900&family=Exo+2:wght@300;400;600&display=swap');
-    
-    .main {
-        background: linear-gradient(135deg, #0a0a2a 0%, #1a1a4a 50%, #0c0c34 100%);
-    }
-    
-    .stApp {
-        background: radial-gradient(circle at 20% 20%, #0a0a2a 0%, #000010 100%);
-        background-attachment: fixed;
-    }
-    
-    h1, h2, h3 {
-        font-family: 'Orbitron', sans-serif !important;
-        color: #00e6ff !important;
-        text-shadow: 0 0 10px #00e6ff, 0 0 20px #00a2ff;
-        letter-spacing: 1px;
-    }
-    
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 2rem;
-        background: rgba(10, 20, 40, 0.8);
-        border-radius: 10px;
-        padding: 10px;
-        backdrop-filter: blur(10px);
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        font-family: 'Orbitron', sans-serif;
-        color: #80d0ff !important;
-        background: rgba(0, 100, 200, 0.2);
-        border-radius: 5px;
-        padding: 10px 20px;
-        transition: all 0.3s;
-        border: 1px solid rgba(0, 150, 255, 0.3);
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background: linear-gradient(90deg, #0066ff, #00ccff) !important;
-        color: white !important;
-        box-shadow: 0 0 15px #0066ff;
-        transform: scale(1.05);
-    }
-    
-    /* Custom metric cards */
-    [data-testid="stMetricValue"] {
-        font-family: 'Orbitron', sans-serif;
-        color: #00ffcc !important;
-        text-shadow: 0 0 10px #00ffcc;
-        font-size: 2.5rem !important;
-        animation: pulse 2s infinite;
-    }
-    
-    @keyframes pulse {
-        0%, 100% { opacity: 1; }
-        50% { opacity: 0.8; }
-    }
-    
-    [data-testid="stMetricLabel"] {
-        font-family: 'Exo 2', sans-serif;
-        color: #a0d0ff !important;
-        font-size: 1.1rem !important;
-    }
-    
-    [data-testid="stMetricDelta"] {
-        font-family: 'Orbitron', sans-serif;
-    }
-    
-    /* Sidebar styling */
-    section[data-testid="stSidebar"] {
-        background: rgba(5, 10, 30, 0.95) !important;
-        border-right: 2px solid #0066ff;
-        backdrop-filter: blur(10px);
-    }
-    
-    .stButton button {
-        font-family: 'Orbitron', sans-serif;
-        background: linear-gradient(90deg, #0066ff, #0088ff);
-        color: white;
-        border: none;
-        padding: 0.5rem 2rem;
-        border-radius: 25px;
-        transition: all 0.3s;
-        box-shadow: 0 0 15px rgba(0, 102, 255, 0.5);
-    }
-    
-    .stButton button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 0 25px rgba(0, 102, 255, 0.8);
-    }
-    
-    /* Dataframe styling */
-    .stDataFrame {
-        background: rgba(10, 25, 50, 0.7) !important;
-        border: 1px solid #00aaff;
-        border-radius: 10px;
-    }
-    
-    /* Custom divider */
-    .st-emotion-cache-1dp5vir {
-        background: linear-gradient(90deg, transparent, #00aaff, transparent);
-        height: 2px;
-    }
-    
-    /* Loading animation */
-    .stSpinner > div {
-        border: 4px solid rgba(0, 150, 255, 0.3);
-        border-radius: 50%;
-        border-top: 4px solid #00e6ff;
-        animation: spin 1s linear infinite;
-    }
-    
-    @keyframes spin {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
-    }
-    
-    /* Glowing border effect */
-    .glow-card {
-        background: rgba(10, 25, 50, 0.3);
-        border: 1px solid rgba(0, 170, 255, 0.3);
-        border-radius: 10px;
-        padding: 20px;
-        box-shadow: 0 0 20px rgba(0, 170, 255, 0.2);
-        transition: all 0.3s;
-    }
-    
-    .glow-card:hover {
-        box-shadow: 0 0 30px rgba(0, 170, 255, 0.4);
-        transform: translateY(-2px);
-    }
-    
-    /* Custom scrollbar */
-    ::-webkit-scrollbar {
-        width: 8px;
-    }
-    
-    ::-webkit-scrollbar-track {
-        background: rgba(10, 20, 40, 0.5);
-    }
-    
-    ::-webkit-scrollbar-thumb {
-        background: linear-gradient(180deg, #0066ff, #00ccff);
-        border-radius: 4px;
-    }
-    
-    /* Tooltip styling */
-    .stTooltip {
-        font-family: 'Exo 2', sans-serif;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    """Inject the theme fonts, stylesheet and header clock once per browser session"""
+    if st.session_state.get("theme_loader"):
+        # The browser confirmed the theme is in the page, which survives reruns
+        st.session_state["theme_injected"] = True
+    if st.session_state.get("theme_injected"):
+        return
+    version = theme_asset_version()
+    font_faces = theme_font_faces(version)
+    st.markdown(f"<style>{font_faces}{THEME_CRITICAL_CSS}</style>", unsafe_allow_html=True)
+    _theme_loader(
+        theme={"stylesheet": f"app/static/{THEME_STYLESHEET}?v={version}", "fontFaces": font_faces},
+        key="theme_loader",
+        default=False
+    )
 
 apply_custom_theme()
 
+# ---------------------------
+# NEO FEED PARSING
+# ---------------------------
+NEO_FEED_MAX_DAYS = 7  # Longest span the feed endpoint serves per request
+# Uncompressed JSON size from which feeds are parsed incrementally. response.json()
+# is faster at every size but holds about three times the body in memory; a real
+# 8-day window (10-30 objects a day, ~1.3 KB each) is only ~0.3 MB.
+NEO_FEED_STREAM_MIN_BYTES = 4 << 20
+NEO_FEED_GZIP_RATIO = 6  # Feed JSON compresses about 6x; estimates the size of gzipped bodies
+
+def new_neo_columns() -> Dict:
+    """Empty columnar buffers for NEO feed rows"""
+    return {
+        "id": [],
+        "name": [],
+        "date": [],
+        "size": array("d"),
+        "distance": array("d"),  # km
+        "speed": array("d"),
+        "hazardous": bytearray(),
+    }
+
+def append_neo_row(columns: Dict, day: str, neo_id: str = "", name: str = "Unknown", size=0,
+                   distance=0, speed=0, hazardous: bool = False):
+    columns["id"].append(neo_id)
+    columns["name"].append(name)
+    columns["date"].append(day)
+    columns["size"].append(float(size))
+    columns["distance"].append(float(distance))
+    columns["speed"].append(float(speed))
+    columns["hazardous"].append(bool(hazardous))
+
+def append_neo_columns(columns: Dict, other: Dict, first_day: str, last_day: str) -> Dict:
+    """Append the rows of ``other`` dated within [first_day, last_day]"""
+    for row, day in enumerate(other["date"]):
+        if first_day <= day <= last_day:
+            append_neo_row(
+                columns, day,
+                neo_id=other["id"][row],
+                name=other["name"][row],
+                size=other["size"][row],
+                distance=other["distance"][row],
+                speed=other["speed"][row],
+                hazardous=other["hazardous"][row],
+            )
+    return columns
+
+def project_neo_feed(neo_data: Dict, columns: Dict) -> Dict:
+    """Append the used fields of an already-parsed feed to columnar buffers"""
+    for day, objects in neo_data.get("near_earth_objects", {}).items():
+        for obj in objects:
+            approach = (obj.get("close_approach_data") or [{}])[0]
+            append_neo_row(
+                columns, day,
+                neo_id=obj.get("id", ""),
+                name=obj.get("name", "Unknown"),
+                size=obj.get("estimated_diameter", {}).get("meters", {}).get("estimated_diameter_max", 0),
+                distance=approach.get("miss_distance", {}).get("kilometers", 0),
+                speed=approach.get("relative_velocity", {}).get("kilometers_per_second", 0),
+                hazardous=obj.get("is_potentially_hazardous_asteroid", False),
+            )
+    return columns
+
+def parse_neo_feed_stream(stream, columns: Dict) -> Dict:
+    """Incrementally parse a feed from a byte stream into columnar buffers.
+
+    Only one feed day is ever materialised: ijson's C backend builds that day's
+    objects, their used fields are appended to the columns, and the day is
+    dropped before the next is read. Peak memory follows the busiest day
+    rather than the whole feed.
+    """
+    for day, objects in ijson.kvitems(stream, "near_earth_objects", use_float=True):
+        project_neo_feed({"near_earth_objects": {day: objects}}, columns)
+    return columns
+
+def read_neo_feed_response(response, columns: Dict) -> Dict:
+    """Parse a streamed feed response into columns.
+
+    Large bodies, and ones of unknown length, are parsed incrementally when
+    ijson is installed so the full parse tree never sits in memory. Anything
+    smaller goes through ``response.json()``, which is quicker on those sizes
+    (see ``python benchmarks.py parsing``).
+    """
+    length = response.headers.get("Content-Length", "")
+    size = int(length) if length.isdigit() else None
+    if size is not None and response.headers.get("Content-Encoding"):
+        size *= NEO_FEED_GZIP_RATIO  # Content-Length counts the compressed bytes
+    if ijson is None or (size is not None and size < NEO_FEED_STREAM_MIN_BYTES):
+        return project_neo_feed(response.json(), columns)
+    response.raw.decode_content = True
+    return parse_neo_feed_stream(response.raw, columns)
+
 # ---------------------------
 # NASA API CONFIGURATION WITH YOUR KEY
 # ---------------------------
+NEVER_EXPIRES = float("inf")
+# Seconds each kind of mutable data stays fresh. Immutable data (past APODs,
+# elapsed NEO feed days, settled rover sols) is cached with NEVER_EXPIRES instead.
+CACHE_TTLS = {
+    "donki": 5 * 60,            # Notifications change within minutes
+    "neo_current": 30 * 60,     # Feed window containing today
+    "epic_latest": 60 * 60,
+    "epic_dates": 60 * 60,
+    "epic_recent_day": 60 * 60, # Frames keep arriving for a day or two
+    "mars_manifest": 6 * 3600,
+    "mars_recent_sol": 60 * 60,
+    "mars_partial": 10 * 60,    # Sol with more pages than were fetched
+    "neo_lookup": 24 * 3600,    # Orbit solutions are refined occasionally
+    "apod_retry": 10 * 60,      # APOD not yet published after the rollover
+}
+# Bounds on the response cache: least recently used entries are evicted past the
+# entry limit, and expired ones once they are too old to show while refreshing
+CACHE_MAX_ENTRIES = 512
+CACHE_STALE_GRACE = 24 * 3600
+APOD_TIMEZONE = ZoneInfo("America/New_York")  # APOD rolls over at US Eastern midnight
+EPIC_SETTLE_DAYS = 2
+MARS_SETTLE_SOLS = 30
+
+def utc_today():
+    return datetime.now(timezone.utc).date()
+
+def next_apod_rollover(now: Optional[float] = None) -> float:
+    """Timestamp of the next APOD publication boundary (US Eastern midnight)"""
+    local = datetime.fromtimestamp(now if now is not None else time.time(), APOD_TIMEZONE)
+    midnight = datetime.combine(local.date() + timedelta(days=1), datetime.min.time(), APOD_TIMEZONE)
+    return midnight.timestamp()
+
+# ---------------------------
+# API KEY POOL
+# ---------------------------
+KEY_REQUESTS_PER_HOUR = 1000      # NASA API limit for regular keys
+DEMO_KEY_REQUESTS_PER_HOUR = 30
+KEY_RETRY_AFTER = 10 * 60         # Probe an exhausted key again after this long, unless told otherwise
+
+def parse_api_keys(keys) -> List[str]:
+    """Unique keys from a comma- or space-separated string, or a list of them"""
+    if isinstance(keys, str):
+        keys = [keys]
+    parsed = []
+    for value in keys or []:
+        parsed.extend(value.replace(",", " ").split())
+    return list(dict.fromkeys(parsed)) or ["DEMO_KEY"]
+
+def mask_api_key(key: str) -> str:
+    """Key shortened for display"""
+    return key if key == "DEMO_KEY" or len(key) <= 8 else f"{key[:4]}…{key[-4:]}"
+
+def _header_int(headers, name: str) -> Optional[int]:
+    """Integer response header, or None if missing or malformed"""
+    value = headers.get(name)
+    return int(value) if value is not None and str(value).isdigit() else None
+
+class APIKeyPool:
+    """NASA API keys with per-key hourly budgets.
+
+    Requests rotate round-robin over the keys that have budget left. Budgets are counted locally and corrected from the
+    X-RateLimit headers of every response. Keys rejected as over their limit
+    (429) sit out until they recover; invalid keys (403) are dropped for good.
+    """
+
+    def __init__(self, keys):
+        self._lock = threading.Lock()
+        self._next = 0  # Rotation position
+        self.keys = {
+            key: {
+                "limit": DEMO_KEY_REQUESTS_PER_HOUR if key == "DEMO_KEY" else KEY_REQUESTS_PER_HOUR,
+                "sent": [],          # Our request times within the last hour
+                "reported": None,    # X-RateLimit-Remaining from the latest response
+                "reported_at": 0.0,
+                "status": "active",  # active, exhausted or invalid
+                "resume_at": 0.0,
+                "total": 0,
+            }
+            for key in parse_api_keys(keys)
+        }
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _remaining(self, state: Dict, now: float) -> int:
+        """Budget left on one key; call with the lock held"""
+        if state["status"] == "exhausted" and now >= state["resume_at"]:
+            state["status"], state["reported"] = "active", None
+        if state["status"] != "active":
+            return 0
+        state["sent"] = [t for t in state["sent"] if now - t < 3600]
+        remaining = state["limit"] - len(state["sent"])
+        if state["reported"] is not None and now - state["reported_at"] < 3600:
+            # The server also counts requests made with this key elsewhere
+            since = sum(1 for t in state["sent"] if t > state["reported_at"])
+            remaining = min(remaining, state["reported"] - since)
+        return max(remaining, 0)
+
+    def acquire(self) -> Optional[str]:
+        """Reserve one request on the next key in rotation with budget left; None if none has any"""
+        with self._lock:
+            now = time.time()
+            keys = list(self.keys)
+            for offset in range(len(keys)):
+                key = keys[(self._next + offset) % len(keys)]
+                state = self.keys[key]
+                if self._remaining(state, now) > 0:
+                    self._next = (self._next + offset + 1) % len(keys)
+                    state["sent"].append(now)
+                    state["total"] += 1
+                    return key
+            return None
+
+    def current(self) -> str:
+        """Key the next request would use, without reserving budget on it.
+
+        Falls back to a key that is only out of budget, then to any key, so
+        there is always one to put in a URL.
+        """
+        with self._lock:
+            now = time.time()
+            keys = list(self.keys)
+            rotation = keys[self._next:] + keys[:self._next]
+            for key in rotation:
+                if self._remaining(self.keys[key], now) > 0:
+                    return key
+            return next((key for key in rotation if self.keys[key]["status"] != "invalid"), rotation[0])
+
+    def record(self, key: str, response) -> bool:
+        """Update a key's budget and status from the response it got; True if the key was taken out of rotation"""
+        with self._lock:
+            state = self.keys[key]
+            now = time.time()
+            limit = _header_int(response.headers, "X-RateLimit-Limit")
+            if limit is not None:
+                state["limit"] = limit
+            reported = _header_int(response.headers, "X-RateLimit-Remaining")
+            if reported is not None:
+                state["reported"], state["reported_at"] = reported, now
+            if response.status_code == 429:
+                retry_after = _header_int(response.headers, "Retry-After")
+                state["status"] = "exhausted"
+                state["resume_at"] = now + (retry_after if retry_after is not None else KEY_RETRY_AFTER)
+                return True
+            if response.status_code == 403 and "API_KEY" in response.text:
+                state["status"] = "invalid"
+                return True
+            return False
+
+    def remaining(self) -> int:
+        """Requests left this hour across every usable key"""
+        with self._lock:
+            now = time.time()
+            return sum(self._remaining(state, now) for state in self.keys.values())
+
+    def seconds_until_available(self) -> float:
+        """0 if a request can go out now, else roughly how long until one can"""
+        with self._lock:
+            now = time.time()
+            waits = []
+            for state in self.keys.values():
+                if self._remaining(state, now) > 0:
+                    return 0.0
+                if state["status"] == "exhausted":
+                    waits.append(state["resume_at"] - now)
+                elif state["status"] == "active":
+                    frees_at = [t + 3600 for t in state["sent"][:1]]
+                    if state["reported"] is not None:
+                        frees_at.append(state["reported_at"] + 3600)
+                    waits.append(min(frees_at, default=now) - now)
+            return max(min(waits, default=float("inf")), 0.0)
+
+    def usage(self) -> List[Dict]:
+        """Per-key status and budget, for display"""
+        with self._lock:
+            now = time.time()
+            rows = []
+            for key, state in self.keys.items():
+                remaining = self._remaining(state, now)  # Also drops requests older than an hour
+                rows.append({
+                    "Key": mask_api_key(key),
+                    "Status": state["status"],
+                    "Used (1h)": len(state["sent"]),
+                    "Remaining": remaining,
+                    "Limit": state["limit"],
+                    "Total": state["total"],
+                })
+            return rows
+
 class NASAApiManager:
     """Enhanced NASA API manager with intelligent caching and rate limiting"""
     
-    def __init__(self, api_key: Optional[str] = None):
-        # Use the provided API key, with fallback to DEMO_KEY
-        self.api_key = api_key or "DEMO_KEY"
-        self.cache = {}
-        self.cache_duration = 1800  # Cache for 30 minutes (reduced from 1 hour)
-        self.request_timestamps = []
-        self.max_requests_per_hour = 1000  # NASA API limit for regular keys
+    def __init__(self, api_key: Union[str, List[str], None] = None):
+        # One key or several (a list, or a comma-separated string), with fallback to DEMO_KEY
+        self.key_pool = APIKeyPool(api_key)
+        self.api_keys = ",".join(self.key_pool.keys)  # Normalised; identifies the shared manager
+        self.cache: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()  # LRU order
+        self._cache_lock = threading.Lock()
+        self.cache_duration = 1800  # Default lifetime; see CACHE_TTLS for per-endpoint policies
+        # Warnings raised while fetching on a background thread are held here for the
+        # script thread, as st.warning only works there. It lives on the manager, which
+        # outlives reruns, since each full rerun executes this file as a new module.
+        self._notices = threading.local()
         
+    @property
+    def api_key(self) -> str:
+        """A usable key for URLs the browser loads directly (EPIC images); reserves no budget"""
+        return self.key_pool.current()
+    
     def _rate_limit(self):
-        """Implement rate limiting"""
-        current_time = time.time()
-        # Remove timestamps older than 1 hour
-        self.request_timestamps = [t for t in self.request_timestamps if current_time - t < 3600]
-        
-        if len(self.request_timestamps) >= self.max_requests_per_hour:
-            sleep_time = 3600 - (current_time - self.request_timestamps[0])
+        """Implement rate limiting: True if any key in the pool has budget left"""
+        sleep_time = self.key_pool.seconds_until_available()
+        if sleep_time == 0:
+            return True
+        if sleep_time < float("inf"):  # Every key invalid: nothing to wait for
             time.sleep(min(sleep_time, 10))
-            return False
-        return True
+        return False
+    
+    def _get(self, url: str, params: Dict, **kwargs) -> requests.Response:
+        """GET with a key from the pool, moving on to the next key only if this one was rejected"""
+        response = None
+        for _ in range(len(self.key_pool)):
+            key = self.key_pool.acquire()
+            if key is None:
+                break
+            response = requests.get(url, params={**params, "api_key": key}, **kwargs)
+            if not self.key_pool.record(key, response):
+                break  # Other errors (a forbidden resource, say) would fail the same way on every key
+            response.close()
+        if response is None:
+            raise requests.HTTPError("No API key has budget left")
+        if response.status_code >= 400:
+            response.close()
+            response.raise_for_status()
+        return response
+    
+    def _warn(self, message: str):
+        """Show a warning, or hold it for the script thread when fetching in the background"""
+        captured = getattr(self._notices, "notices", None)
+        if captured is not None:
+            captured.append(message)
+        else:
+            st.warning(message)
+    
+    def collect_notices(self, fetch: Callable[[], Dict]):
+        """Run a fetch on a worker thread, returning its data and any warnings it raised"""
+        self._notices.notices = []
+        try:
+            return fetch(), self._notices.notices
+        finally:
+            self._notices.notices = None
         
+    def _get_cache_entry(self, endpoint: str) -> Optional[Tuple[Dict, float]]:
+        """(data, expires_at) if cached and not expired, marking the entry as recently used"""
+        with self._cache_lock:
+            entry = self.cache.get(endpoint)
+            if entry is None or time.time() >= entry[1]:
+                return None
+            self.cache.move_to_end(endpoint)
+            return entry
+    
     def _get_cached_data(self, endpoint: str) -> Optional[Dict]:
         """Get cached data if available and not expired"""
-        if endpoint in self.cache:
-            data, timestamp = self.cache[endpoint]
-            if time.time() - timestamp < self.cache_duration:
-                return data
-        return None
+        entry = self._get_cache_entry(endpoint)
+        return entry[0] if entry else None
+    
+    def _cache_data(self, endpoint: str, data: Dict, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        """Cache data until ``expires_at``, or for ``ttl`` seconds (default cache_duration)"""
+        now = time.time()
+        if expires_at is None:
+            expires_at = now + (ttl if ttl is not None else self.cache_duration)
+        with self._cache_lock:
+            self.cache[endpoint] = (data, expires_at)
+            self.cache.move_to_end(endpoint)
+            for key in [key for key, (_, expiry) in self.cache.items() if expiry + CACHE_STALE_GRACE < now]:
+                del self.cache[key]
+            while len(self.cache) > CACHE_MAX_ENTRIES:
+                self.cache.popitem(last=False)
     
-    def _cache_data(self, endpoint: str, data: Dict):
-        """Cache data with timestamp"""
-        self.cache[endpoint] = (data, time.time())
+    def peek(self, endpoint: str):
+        """Return (data, is_fresh) for an endpoint without fetching; recently expired data is still returned"""
+        entry = self.cache.get(endpoint)
+        if entry is None:
+            return None, False
+        data, expires_at = entry
+        return data, time.time() < expires_at
     
     def get_apod(self, date: str = None) -> Dict:
         """Astronomy Picture of the Day"""
@@ -226,23 +527,28 @@ class NASAApiManager:
             
         try:
             if not self._rate_limit():
-                st.warning("Rate limit approached, using cached data")
+                self._warn("Rate limit approached, using cached data")
                 return self._get_cached_data(endpoint) or self._get_default_apod()
                 
             url = "https://api.nasa.gov/planetary/apod"
-            params = {"api_key": self.api_key}
+            params = {}
             if date:
                 params["date"] = date
             
-            response = requests.get(url, params=params, timeout=15)
-            response.raise_for_status()
+            response = self._get(url, params, timeout=15)
             data = response.json()
             
-            self.request_timestamps.append(time.time())
-            self._cache_data(endpoint, data)
+            apod_today = datetime.now(APOD_TIMEZONE).strftime("%Y-%m-%d")
+            if date and date < apod_today:
+                self._cache_data(endpoint, data, expires_at=NEVER_EXPIRES)
+            elif data.get("date", apod_today) < apod_today:
+                # Still yesterday's picture just after the rollover: check again shortly
+                self._cache_data(endpoint, data, ttl=CACHE_TTLS["apod_retry"])
+            else:
+                self._cache_data(endpoint, data, expires_at=next_apod_rollover())
             return data
         except Exception as e:
-            st.warning(f"APOD API unavailable: {str(e)[:50]}... Using cached/fallback data")
+            self._warn(f"APOD API unavailable: {str(e)[:50]}... Using cached/fallback data")
             return self._get_default_apod(date)
     
     def _get_default_apod(self, date: str = None):
@@ -269,30 +575,57 @@ class NASAApiManager:
             
         try:
             if not self._rate_limit():
-                st.warning("Rate limit approached, using simulated NEO data")
+                self._warn("Rate limit approached, using simulated NEO data")
                 return self._generate_mock_neo_data(days)
                 
-            end_date = datetime.today()
+            end_date = datetime.today().date()
             start_date = end_date - timedelta(days=days)
+            first_day, last_day = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
             
-            url = "https://api.nasa.gov/neo/rest/v1/feed"
-            params = {
-                "api_key": self.api_key,
-                "start_date": start_date.strftime("%Y-%m-%d"),
-                "end_date": end_date.strftime("%Y-%m-%d")
-            }
+            # Windows sit on a fixed calendar grid so elapsed ones are shared by every
+            # range and every later day; only the window holding today is ever refetched
+            span = NEO_FEED_MAX_DAYS + 1
+            columns = new_neo_columns()
+            expires_at = NEVER_EXPIRES
+            for window in range(start_date.toordinal() // span, end_date.toordinal() // span + 1):
+                window_start = datetime.fromordinal(window * span).date()
+                window_end = min(window_start + timedelta(days=NEO_FEED_MAX_DAYS), end_date)
+                window_columns, window_expires = self._get_neo_window(window_start, window_end)
+                append_neo_columns(columns, window_columns, first_day, last_day)
+                expires_at = min(expires_at, window_expires)
             
-            response = requests.get(url, params=params, timeout=15)
-            response.raise_for_status()
-            data = response.json()
-            
-            self.request_timestamps.append(time.time())
-            self._cache_data(endpoint, data)
+            data = {"element_count": len(columns["id"]), "neo_columns": columns}
+            data["index"] = NEOIndex(data)  # Cached with the feed, so reruns never rebuild it
+            self._cache_data(endpoint, data, expires_at=expires_at)
             return data
         except Exception as e:
-            st.warning(f"NEO API unavailable: {str(e)[:50]}... Using simulated data")
+            self._warn(f"NEO API unavailable: {str(e)[:50]}... Using simulated data")
             return self._generate_mock_neo_data(days)
     
+    def _get_neo_window(self, window_start, window_end):
+        """Feed columns for one calendar window, and when they expire; elapsed windows never do"""
+        endpoint = f"neo_window_{window_start}_{window_end}"
+        cached = self._get_cache_entry(endpoint)
+        if cached:
+            return cached
+        
+        url = "https://api.nasa.gov/neo/rest/v1/feed"
+        params = {
+            "start_date": window_start.strftime("%Y-%m-%d"),
+            "end_date": window_end.strftime("%Y-%m-%d")
+        }
+        
+        columns = new_neo_columns()
+        with self._get(url, params, timeout=15, stream=True) as response:
+            read_neo_feed_response(response, columns)
+        
+        if window_end < utc_today():
+            expires_at = NEVER_EXPIRES
+        else:
+            expires_at = time.time() + CACHE_TTLS["neo_current"]
+        self._cache_data(endpoint, columns, expires_at=expires_at)
+        return columns, expires_at
+    
     def _generate_mock_neo_data(self, days: int) -> Dict:
         """Generate realistic mock NEO data"""
         neo_data = {"near_earth_objects": {}}
@@ -309,6 +642,7 @@ class NASAApiManager:
                 distance = random.uniform(5000000, 40000000)
                 
                 objects.append({
+                    "id": f"mock-{date_str}-{j}",
                     "name": f"(2024-{random.choice(['AB', 'CD', 'EF', 'GH'])}{j:02d})",
                     "estimated_diameter": {
                         "meters": {
@@ -326,6 +660,141 @@ class NASAApiManager:
         
         return neo_data
     
+    def get_neo_lookup(self, neo_id: str) -> Dict:
+        """Single NEO record including its orbital elements, cached per object"""
+        endpoint = f"neo_lookup_{neo_id}"
+        cached = self._get_cached_data(endpoint)
+        if cached:
+            return cached
+        
+        if neo_id.startswith("mock-"):
+            data = self._generate_mock_orbital_data(neo_id)
+            self._cache_data(endpoint, data, expires_at=NEVER_EXPIRES)
+            return data
+            
+        try:
+            if not self._rate_limit():
+                return {}
+                
+            url = f"https://api.nasa.gov/neo/rest/v1/neo/{neo_id}"
+            response = self._get(url, {}, timeout=15)
+            data = response.json()
+            
+            self._cache_data(endpoint, data, ttl=CACHE_TTLS["neo_lookup"])
+            return data
+        except:
+            return {}
+    
+    def _generate_mock_orbital_data(self, neo_id: str) -> Dict:
+        """Plausible near-Earth orbit for simulated objects, stable per id"""
+        rng = random.Random(neo_id)
+        a = rng.uniform(0.8, 2.2)
+        return {
+            "id": neo_id,
+            "orbital_data": {
+                "epoch_osculation": "2460600.5",
+                "semi_major_axis": str(a),
+                "eccentricity": str(rng.uniform(0.05, 0.6)),
+                "inclination": str(rng.uniform(0, 25)),
+                "ascending_node_longitude": str(rng.uniform(0, 360)),
+                "perihelion_argument": str(rng.uniform(0, 360)),
+                "mean_anomaly": str(rng.uniform(0, 360)),
+                "mean_motion": str(GAUSS_MEAN_MOTION / a ** 1.5)
+            }
+        }
+    
+    def get_neo_browse_page(self, page: int, size: int = 20) -> Dict:
+        """One page of the full NEO catalog; not cached here, the catalog ingester checkpoints pages to disk"""
+        try:
+            if not self._rate_limit():
+                return {}
+                
+            url = "https://api.nasa.gov/neo/rest/v1/neo/browse"
+            params = {"page": page, "size": size}
+            
+            response = self._get(url, params, timeout=30)
+            data = response.json()
+            
+            return data
+        except:
+            return {}
+    
+    def remaining_requests(self) -> int:
+        """Requests left in the current hourly budget, across the whole key pool"""
+        return self.key_pool.remaining()
+    
+    def get_mars_manifest(self, rover: str) -> Dict:
+        """Mission manifest for a rover: max sol, totals and the cameras used on every sol with photos"""
+        endpoint = f"mars_manifest_{rover.lower()}"
+        cached = self._get_cached_data(endpoint)
+        if cached:
+            return cached
+            
+        try:
+            if not self._rate_limit():
+                return {}
+                
+            url = f"https://api.nasa.gov/mars-photos/api/v1/manifests/{rover.lower()}"
+            response = self._get(url, {}, timeout=15)
+            data = response.json().get("photo_manifest", {})
+            
+            # A finished mission's manifest never changes
+            if data.get("status") == "complete":
+                self._cache_data(endpoint, data, expires_at=NEVER_EXPIRES)
+            else:
+                self._cache_data(endpoint, data, ttl=CACHE_TTLS["mars_manifest"])
+            return data
+        except:
+            return {}
+    
+    def get_mars_photos(self, rover: str, sol: int, camera: str = "ALL", max_pages: int = 4) -> Dict:
+        """Rover photos for one (rover, sol, camera), fetched page by page and cached as a unit.
+
+        At most ``max_pages`` pages are fetched; a result cut short by that cap or
+        by the rate limit is marked ``partial`` and cached only briefly.
+        """
+        endpoint = f"mars_photos_{rover.lower()}_{sol}_{camera}"
+        cached = self._get_cached_data(endpoint)
+        if cached:
+            return cached
+        
+        # A cached manifest tells us which sols and cameras have photos without asking the API
+        manifest, _ = self.peek(f"mars_manifest_{rover.lower()}")
+        # Sols well behind the rover (or from a finished mission) will not gain photos
+        settled = bool(manifest) and (manifest.get("status") == "complete" or sol <= manifest.get("max_sol", 0) - MARS_SETTLE_SOLS)
+        expiry = {"expires_at": NEVER_EXPIRES} if settled else {"ttl": CACHE_TTLS["mars_recent_sol"]}
+        if manifest and sol not in mars_photo_sols(manifest, camera):
+            data = {"photos": []}
+            self._cache_data(endpoint, data, **expiry)
+            return data
+            
+        try:
+            url = f"https://api.nasa.gov/mars-photos/api/v1/rovers/{rover.lower()}/photos"
+            photos = []
+            partial = True  # Until a short page shows the sol is exhausted
+            for page in range(1, max_pages + 1):
+                if not self._rate_limit():
+                    break
+                params = {"sol": sol, "page": page}
+                if camera != "ALL":
+                    params["camera"] = camera.lower()
+                
+                response = self._get(url, params, timeout=15)
+                batch = response.json().get("photos", [])
+                
+                photos.extend(batch)
+                if len(batch) < MARS_PHOTOS_PAGE_SIZE:
+                    partial = False
+                    break
+            
+            if partial and not photos:
+                return {"photos": []}  # Rate limited before the first page: nothing worth caching
+            data = {"photos": photos, "partial": partial}
+            self._cache_data(endpoint, data, **({"ttl": CACHE_TTLS["mars_partial"]} if partial else expiry))
+            return data
+        except:
+            return {"photos": []}
+    
     def get_epic_images(self) -> Dict:
         """Earth Polychromatic Imaging Camera images"""
         endpoint = "epic_images"
@@ -339,18 +808,70 @@ class NASAApiManager:
                 
             # Get latest EPIC images
             url = f"https://api.nasa.gov/EPIC/api/natural"
-            params = {"api_key": self.api_key}
-            
-            response = requests.get(url, params=params, timeout=15)
-            response.raise_for_status()
+            response = self._get(url, {}, timeout=15)
             data = response.json()
             
-            self.request_timestamps.append(time.time())
-            self._cache_data(endpoint, {"images": data[:4]})  # Store only first 4 images
+            self._cache_data(endpoint, {"images": data[:4]}, ttl=CACHE_TTLS["epic_latest"])  # Store only first 4 images
             return {"images": data[:4]}
         except:
             return {"images": []}
     
+    def get_epic_dates(self) -> List[str]:
+        """Every date with natural-color EPIC imagery, oldest first"""
+        endpoint = "epic_dates"
+        cached = self._get_cached_data(endpoint)
+        if cached:
+            return cached
+            
+        try:
+            if not self._rate_limit():
+                return []
+                
+            url = "https://api.nasa.gov/EPIC/api/natural/available"
+            response = self._get(url, {}, timeout=15)
+            data = sorted(response.json())
+            
+            self._cache_data(endpoint, data, ttl=CACHE_TTLS["epic_dates"])
+            return data
+        except:
+            return []
+    
+    def get_epic_day(self, date: str) -> List[Dict]:
+        """Metadata for every EPIC frame taken on a date"""
+        endpoint = f"epic_day_{date}"
+        cached = self._get_cached_data(endpoint)
+        if cached:
+            return cached
+            
+        try:
+            if not self._rate_limit():
+                return []
+                
+            url = f"https://api.nasa.gov/EPIC/api/natural/date/{date}"
+            response = self._get(url, {}, timeout=15)
+            data = sorted(response.json(), key=lambda frame: frame.get("date", ""))
+            
+            if date <= (utc_today() - timedelta(days=EPIC_SETTLE_DAYS)).strftime("%Y-%m-%d"):
+                self._cache_data(endpoint, data, expires_at=NEVER_EXPIRES)
+            else:
+                self._cache_data(endpoint, data, ttl=CACHE_TTLS["epic_recent_day"])
+            return data
+        except:
+            return []
+    
+    def get_epic_frame(self, date: str, image: str) -> Optional[bytes]:
+        """Raw JPEG for one EPIC frame; not cached in memory, the time-lapse is cached on disk"""
+        try:
+            if not self._rate_limit():
+                return None
+                
+            url = f"https://api.nasa.gov/EPIC/archive/natural/{date.replace('-', '/')}/jpg/{image}.jpg"
+            response = self._get(url, {}, timeout=30)
+            
+            return response.content
+        except:
+            return None
+    
     def get_donki_alerts(self) -> Dict:
         """Space weather alerts from DONKI"""
         endpoint = "donki_alerts"
@@ -364,63 +885,948 @@ class NASAApiManager:
                 
             url = "https://api.nasa.gov/DONKI/notifications"
             params = {
-                "api_key": self.api_key,
                 "startDate": (datetime.today() - timedelta(days=7)).strftime("%Y-%m-%d"),
                 "endDate": datetime.today().strftime("%Y-%m-%d"),
                 "type": "FLR,SEP,CME"
             }
             
-            response = requests.get(url, params=params, timeout=15)
-            response.raise_for_status()
+            response = self._get(url, params, timeout=15)
             data = response.json()
             
-            self.request_timestamps.append(time.time())
-            self._cache_data(endpoint, {"alerts": data[:5]})  # Store only first 5 alerts
+            self._cache_data(endpoint, {"alerts": data[:5]}, ttl=CACHE_TTLS["donki"])  # Store only first 5 alerts
             return {"alerts": data[:5]}
         except:
             return {"alerts": []}
 
+@st.cache_resource(show_spinner=False)
+def get_nasa_api(api_key: str) -> NASAApiManager:
+    """Shared API manager per key pool, so its cache and key budgets survive reruns and sessions"""
+    return NASAApiManager(api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """Thread pool for concurrent section fetches in progressive mode"""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="nasa-fetch")
+
+# ---------------------------
+# PROGRESSIVE RENDERING
+# ---------------------------
+# Set while a section is drawn from stale data that will be redrawn in the same
+# run; widgets can only be created once per run, so such renders are read-only.
+_stale_render = contextvars.ContextVar("stale_render", default=False)
+
+def is_stale_render() -> bool:
+    """True while drawing a placeholder that will be replaced by fresh data"""
+    return _stale_render.get()
+
+def load_section(nasa_api: NASAApiManager, endpoint: str, fetch: Callable[[], Dict],
+                 render: Callable[[Dict], None], loading_text: str, pending: Optional[List] = None):
+    """Render a section from its data source.
+
+    Without ``pending`` the fetch blocks under a spinner. With it, the section is
+    drawn straight away from cached or stale data into a placeholder, the fetch
+    starts on the executor, and ``resolve_pending_sections`` redraws it in place.
+    """
+    if pending is None:
+        with st.spinner(loading_text):
+            data = fetch()
+        render(data)
+        return
+
+    placeholder = st.empty()
+    data, fresh = nasa_api.peek(endpoint)
+    token = _stale_render.set(not fresh)
+    try:
+        with placeholder.container():
+            if data is not None:
+                render(data)
+            else:
+                st.info(loading_text)
+    finally:
+        _stale_render.reset(token)
+    if not fresh:
+        future = get_fetch_executor().submit(nasa_api.collect_notices, fetch)
+        pending.append((placeholder, future, render))
+
+def resolve_pending_sections(pending: List):
+    """Fill each progressive placeholder as soon as its fetch completes"""
+    futures = {future: (placeholder, render) for placeholder, future, render in pending}
+    for future in as_completed(futures):
+        placeholder, render = futures[future]
+        data, notices = future.result()
+        with placeholder.container():
+            for notice in notices:
+                st.warning(notice)
+            render(data)
+
+# Set for the duration of a full script run. Fragment reruns skip main(), so
+# their sections queue and resolve their own progressive fetches.
+_full_run = contextvars.ContextVar("full_run", default=False)
+
+def rerunnable_section(create: Callable[[NASAApiManager, Optional[List]], None]):
+    """Make a dashboard section a fragment: its widgets rerun only that section"""
+    @st.fragment
+    @functools.wraps(create)
+    def section(nasa_api: NASAApiManager, pending: Optional[List] = None):
+        if _full_run.get():
+            create(nasa_api, pending)
+            return
+        # The pending list passed in belongs to the full run that first drew us
+        pending = [] if st.session_state.get("progressive_mode", True) else None
+        create(nasa_api, pending)
+        if pending:
+            resolve_pending_sections(pending)
+    return section
+
+# ---------------------------
+# PROFILING
+# ---------------------------
+# Admins (``?admin=<DASHBOARD_ADMIN_TOKEN>``) can run a single rerun of main()
+# under cProfile and tracemalloc, via ``?profile=1`` or the sidebar button.
+PROFILE_TOP_FUNCTIONS = 30
+PROFILE_TOP_ALLOCATIONS = 20
+PROFILE_TRACEBACK_FRAMES = 10
+
+# Per-section wall times of the rerun being profiled; None when not profiling
+_section_timings = contextvars.ContextVar("section_timings", default=None)
+
+@st.cache_resource(show_spinner=False)
+def get_profile_lock() -> threading.Lock:
+    """cProfile and tracemalloc are process-wide, so only one session profiles at a time.
+
+    Held in the resource cache: a module-level lock would be recreated by every
+    full rerun, which executes this file as a new module.
+    """
+    return threading.Lock()
+
+def profiling_active() -> bool:
+    """True while the current rerun is being profiled"""
+    return _section_timings.get() is not None
+
+@contextmanager
+def timed_section(name: str):
+    """Record the wall time of a block in the profile report, if profiling"""
+    timings = _section_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.append((name, time.perf_counter() - start))
+
+def is_admin() -> bool:
+    """True when the ``admin`` query parameter matches DASHBOARD_ADMIN_TOKEN"""
+    token = os.environ.get("DASHBOARD_ADMIN_TOKEN")
+    if not token:
+        return False
+    # compare_digest only accepts ASCII str, and the query string is visitor-controlled
+    return hmac.compare_digest(st.query_params.get("admin", "").encode(), token.encode())
+
+def profile_requested() -> bool:
+    """Consume a pending profiling request so only one rerun is profiled"""
+    requested = st.session_state.pop("profile_requested", False)
+    if st.query_params.get("profile") == "1":
+        del st.query_params["profile"]
+        requested = True
+    return requested and is_admin()
+
+def profile_rerun(fn: Callable[[], None]) -> Optional[Dict[str, Any]]:
+    """Run fn under the CPU profiler and allocation tracer and collect the results.
+
+    Returns None without running fn if another session is already profiling.
+    """
+    lock = get_profile_lock()
+    if not lock.acquire(blocking=False):
+        return None
+    timings = []
+    token = _section_timings.set(timings)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(PROFILE_TRACEBACK_FRAMES)
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        profiler.enable()
+        try:
+            fn()
+        finally:
+            profiler.disable()
+        wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        peak = tracemalloc.get_traced_memory()[1]
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+        _section_timings.reset(token)
+        lock.release()
+    return {
+        "profiler": profiler,
+        "wall": wall,
+        "cpu": cpu,
+        "peak": peak,
+        "snapshot": snapshot,
+        "sections": timings,
+    }
+
+def _profile_location(filename: str, line: int) -> str:
+    """Shorten source paths to the project or the installed package they belong to"""
+    if filename.startswith(os.getcwd() + os.sep):
+        filename = os.path.relpath(filename)
+    elif "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{filename}:{line}"
+
+def profile_function_table(profiler: cProfile.Profile, sort_by: str) -> pd.DataFrame:
+    """Top functions of a profile, ranked by cumulative or own time"""
+    stats = pstats.Stats(profiler)
+    rows = [
+        {
+            "Function": func,
+            "Location": _profile_location(filename, line),
+            "Calls": calls,
+            "Own (ms)": own * 1000,
+            "Cumulative (ms)": cumulative * 1000,
+        }
+        for (filename, line, func), (_, calls, own, cumulative, _) in stats.stats.items()
+    ]
+    column = "Cumulative (ms)" if sort_by == "cumulative" else "Own (ms)"
+    return pd.DataFrame(rows).sort_values(column, ascending=False).head(PROFILE_TOP_FUNCTIONS)
+
+def profile_allocation_table(snapshot: tracemalloc.Snapshot, limit: Optional[int] = PROFILE_TOP_ALLOCATIONS) -> pd.DataFrame:
+    """Source lines holding the most memory still allocated at the end of the rerun"""
+    snapshot = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ])
+    stats = snapshot.statistics("lineno")[:limit]
+    return pd.DataFrame([
+        {
+            "Location": _profile_location(stat.traceback[0].filename, stat.traceback[0].lineno),
+            "Size (KB)": stat.size / 1024,
+            "Blocks": stat.count,
+        }
+        for stat in stats
+    ], columns=["Location", "Size (KB)", "Blocks"])
+
+def summarize_profile(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Everything the report shows, small enough to keep in session state across reruns"""
+    with tempfile.NamedTemporaryFile(suffix=".prof", delete=False) as f:
+        path = f.name
+    try:
+        profile["profiler"].dump_stats(path)
+        with open(path, "rb") as f:
+            raw = f.read()
+    finally:
+        os.remove(path)
+    return {
+        "wall": profile["wall"],
+        "cpu": profile["cpu"],
+        "peak": profile["peak"],
+        "calls": pstats.Stats(profile["profiler"]).total_calls,
+        "sections": profile["sections"],
+        "functions": {
+            sort_by: profile_function_table(profile["profiler"], sort_by)
+            for sort_by in ("cumulative", "own")
+        },
+        "allocations": profile_allocation_table(profile["snapshot"]),
+        "allocations_csv": profile_allocation_table(profile["snapshot"], limit=None).to_csv(index=False),
+        "raw": raw,
+        "stamp": datetime.now().strftime('%Y%m%d_%H%M%S'),
+    }
+
+def render_profile_report(profile: Dict[str, Any]):
+    """Show the top functions, section timings and allocation hotspots of a profiled rerun"""
+    with st.expander("🧪 Profile of the last profiled rerun", expanded=True):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("⏱️ Wall time", f"{profile['wall'] * 1000:,.0f} ms")
+        with col2:
+            st.metric("🧮 CPU time", f"{profile['cpu'] * 1000:,.0f} ms")
+        with col3:
+            st.metric("🧠 Peak allocations", f"{profile['peak'] / 1e6:,.1f} MB")
+        with col4:
+            st.metric("📞 Function calls", f"{profile['calls']:,}")
+
+        if profile["sections"]:
+            st.markdown("#### 🧭 Wall time per section")
+            sections = pd.DataFrame(profile["sections"], columns=["Section", "Seconds"])
+            fig = px.bar(
+                sections, x=sections["Seconds"] * 1000, y="Section", orientation="h",
+                labels={"x": "Wall time (ms)"}, color_discrete_sequence=["#00aaff"]
+            )
+            fig.update_layout(
+                yaxis=dict(autorange="reversed"),
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#80d0ff'),
+                height=max(250, 28 * len(sections))
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+        st.markdown("#### 🔥 Top functions")
+        sort_by = st.radio("Rank by", ["cumulative", "own"], horizontal=True, key="profile_sort")
+        st.dataframe(
+            profile["functions"][sort_by],
+            column_config={
+                "Own (ms)": st.column_config.NumberColumn(format="%.1f"),
+                "Cumulative (ms)": st.column_config.NumberColumn(format="%.1f"),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+        st.markdown("#### 🧠 Allocation hotspots")
+        st.dataframe(
+            profile["allocations"],
+            column_config={"Size (KB)": st.column_config.NumberColumn(format="%.1f")},
+            hide_index=True,
+            use_container_width=True
+        )
+
+        stamp = profile["stamp"]
+        col_dl1, col_dl2, col_close = st.columns([2, 2, 1])
+        with col_dl1:
+            st.download_button(
+                "📥 Download CPU profile (.prof)",
+                profile["raw"],
+                f"dashboard_{stamp}.prof",
+                "application/octet-stream",
+                use_container_width=True
+            )
+        with col_dl2:
+            st.download_button(
+                "📥 Download allocations (CSV)",
+                profile["allocations_csv"],
+                f"dashboard_allocations_{stamp}.csv",
+                "text/csv",
+                use_container_width=True
+            )
+        with col_close:
+            st.button(
+                "✖️ Close",
+                on_click=lambda: st.session_state.pop("profile_report", None),
+                use_container_width=True
+            )
+        st.caption("Open the .prof file with `python -m pstats` or `snakeviz`.")
+
+# ---------------------------
+# EPIC TIME-LAPSE
+# ---------------------------
+EPIC_TIMELAPSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "epic_timelapse")
+EPIC_FRAME_SIZES = [256, 512, 768]
+EPIC_DOWNLOAD_WORKERS = 6
+EPIC_DECODE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+# Forking a threaded server copies locks held by other threads into the workers,
+# which can deadlock them; spawned workers start clean and only import epic_frames
+EPIC_DECODE_CONTEXT = multiprocessing.get_context("spawn")
+
+def epic_timelapse_path(date: str, size: int) -> str:
+    return os.path.join(EPIC_TIMELAPSE_DIR, date, f"earth_{size}px.gif")
+
+def build_epic_timelapse(nasa_api: NASAApiManager, date: str, size: int) -> Optional[str]:
+    """Encode every EPIC frame of a date into an animated GIF on disk, once per (date, size).
+
+    Frames download concurrently on threads; decoding and resizing run in a
+    process pool so they use every core instead of contending for the GIL.
+    """
+    path = epic_timelapse_path(date, size)
+    if os.path.exists(path):
+        return path
+    
+    frames = nasa_api.get_epic_day(date)
+    if not frames:
+        return None
+    with ThreadPoolExecutor(max_workers=EPIC_DOWNLOAD_WORKERS, thread_name_prefix="epic-download") as pool:
+        downloads = list(pool.map(nasa_api.get_epic_frame, repeat(date), [frame["image"] for frame in frames]))
+    downloads = [data for data in downloads if data]
+    if not downloads:
+        return None
+    
+    with ProcessPoolExecutor(max_workers=EPIC_DECODE_WORKERS, mp_context=EPIC_DECODE_CONTEXT) as pool:
+        decoded = list(pool.map(epic_frames.decode_frame, downloads, repeat(size)))
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with atomic_output(path) as tmp_path:  # Sessions building the same GIF never share a temp file
+        epic_frames.encode_gif(decoded, size, tmp_path)
+    return path
+
+# ---------------------------
+# MARS ROVER PHOTOS
+# ---------------------------
+MARS_ROVER_CAMERAS = {
+    "Curiosity": ["FHAZ", "RHAZ", "MAST", "CHEMCAM", "MAHLI", "MARDI", "NAVCAM"],
+    "Perseverance": ["NAVCAM_LEFT", "NAVCAM_RIGHT", "MCZ_LEFT", "MCZ_RIGHT", "FRONT_HAZCAM_LEFT_A",
+                     "FRONT_HAZCAM_RIGHT_A", "REAR_HAZCAM_LEFT", "REAR_HAZCAM_RIGHT", "SKYCAM", "SHERLOC_WATSON"],
+    "Opportunity": ["FHAZ", "RHAZ", "NAVCAM", "PANCAM", "MINITES"],
+    "Spirit": ["FHAZ", "RHAZ", "NAVCAM", "PANCAM", "MINITES"],
+}
+MARS_MAX_SOL = 5000  # Upper bound until the manifest reports the real one
+MARS_PHOTOS_PAGE_SIZE = 25  # Fixed by the API
+MARS_PHOTOS_SHOWN = 12
+MARS_PREFETCH_SOLS = 2  # Sols prefetched on each side of the selected one
+
+# ---------------------------
+# NEO INDEX
+# ---------------------------
+NEO_MAX_DISTANCE_MKM = 80.0  # The feed reports approaches within ~0.5 AU
+NEO_MAX_SPEED_KMS = 50.0
+
+class NEOIndex:
+    """Columnar, multi-attribute index over one NEO feed.
+
+    The feed is flattened once into arrays. Each range attribute keeps its row
+    order sorted by value, so a range query is two binary searches. The most
+    selective range drives the candidate set and the remaining predicates,
+    including the hazardous bitmap, are checked only on those candidates.
+    """
+    RANGE_FIELDS = ("size", "distance", "speed", "date")
+    # Frame column each sortable field appears as in ``to_frame``
+    FRAME_COLUMNS = {"distance": "Distance (M km)", "size": "Size (m)", "speed": "Speed (km/s)", "date": "Date", "name": "Name"}
+    
+    def __init__(self, neo_data: Dict):
+        # Live feeds arrive already columnar; simulated ones are projected here
+        columns = neo_data.get("neo_columns") or project_neo_feed(neo_data, new_neo_columns())
+        
+        self.ids = np.array(columns["id"], dtype=object)
+        self.names = np.array(columns["name"], dtype=object)
+        self.columns = {
+            "size": np.frombuffer(columns["size"], dtype=float),
+            "distance": np.frombuffer(columns["distance"], dtype=float),  # km
+            "speed": np.frombuffer(columns["speed"], dtype=float),
+            "date": np.array(columns["date"], dtype="datetime64[D]"),
+        }
+        self.hazardous = np.frombuffer(columns["hazardous"], dtype=bool)
+        self.order = {field: np.argsort(values, kind="stable") for field, values in self.columns.items()}
+        self.order["name"] = np.argsort(self.names, kind="stable")
+        self.sorted = {field: self.columns[field][self.order[field]] for field in self.RANGE_FIELDS}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def _bound(self, field: str, value):
+        return np.datetime64(value, "D") if field == "date" else value
+    
+    def range_slice(self, field: str, low=None, high=None) -> Tuple[int, int]:
+        """Bounds into ``order[field]`` of rows with low <= value <= high"""
+        values = self.sorted[field]
+        start = 0 if low is None else int(np.searchsorted(values, self._bound(field, low), side="left"))
+        stop = len(values) if high is None else int(np.searchsorted(values, self._bound(field, high), side="right"))
+        return start, max(start, stop)
+    
+    def query(self, hazardous_only: bool = False, **ranges: Tuple) -> np.ndarray:
+        """Row positions (ascending) matching every (low, high) range and the hazard filter"""
+        bounds = {field: rng for field, rng in ranges.items() if rng is not None and rng != (None, None)}
+        if not bounds:
+            candidates = np.flatnonzero(self.hazardous) if hazardous_only else np.arange(len(self))
+            return candidates
+        
+        slices = {field: self.range_slice(field, *rng) for field, rng in bounds.items()}
+        driver = min(slices, key=lambda field: slices[field][1] - slices[field][0])
+        start, stop = slices[driver]
+        candidates = self.order[driver][start:stop]
+        
+        keep = np.ones(len(candidates), dtype=bool)
+        if hazardous_only:
+            keep &= self.hazardous[candidates]
+        for field, (low, high) in bounds.items():
+            if field == driver:
+                continue
+            values = self.columns[field][candidates]
+            if low is not None:
+                keep &= values >= self._bound(field, low)
+            if high is not None:
+                keep &= values <= self._bound(field, high)
+        return np.sort(candidates[keep])
+    
+    def nearest(self, k: int, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """The k closest approaches, optionally among already-matched positions"""
+        order = self.order["distance"]
+        if positions is None:
+            return order[:k]
+        allowed = np.zeros(len(self), dtype=bool)
+        allowed[positions] = True
+        return order[allowed[order]][:k]
+    
+    def to_frame(self, positions: np.ndarray) -> pd.DataFrame:
+        """Dashboard rows for the given positions"""
+        return pd.DataFrame({
+            "ID": self.ids[positions],
+            "Date": self.columns["date"][positions].astype(str),
+            "Name": self.names[positions],
+            "Size (m)": self.columns["size"][positions],
+            "Distance (M km)": self.columns["distance"][positions] / 1e6,
+            "Speed (km/s)": self.columns["speed"][positions],
+            "Hazardous": np.where(self.hazardous[positions], "⚠️ DANGER", "✅ SAFE"),
+        })
+    
+    def frame_orders(self, positions: np.ndarray) -> Dict[str, np.ndarray]:
+        """Stable row order of ``to_frame(positions)`` for every sortable column, taken from the index"""
+        rows = np.full(len(self), -1)
+        rows[positions] = np.arange(len(positions))
+        orders = {}
+        for field, column in self.FRAME_COLUMNS.items():
+            order = rows[self.order[field]]
+            orders[column] = order[order >= 0]
+        return orders
+
+def get_neo_index(neo_data: Dict) -> NEOIndex:
+    """Index for a feed: live feeds carry the one built when they were cached, simulated ones are indexed here"""
+    index = neo_data.get("index")
+    return index if index is not None else NEOIndex(neo_data)
+
+# ---------------------------
+# ORBIT PROPAGATION
+# ---------------------------
+GAUSS_MEAN_MOTION = 0.9856076686  # deg/day for a = 1 AU around the Sun
+J2000_JD = 2451545.0
+ORBIT_ELEMENT_FIELDS = {
+    "a": "semi_major_axis",
+    "e": "eccentricity",
+    "i": "inclination",
+    "node": "ascending_node_longitude",
+    "peri": "perihelion_argument",
+    "M0": "mean_anomaly",
+    "epoch": "epoch_osculation",
+    "n": "mean_motion",
+}
+# Earth's mean J2000 elements, propagated alongside the NEOs for reference
+EARTH_ELEMENTS = {
+    "a": np.array([1.00000261]),
+    "e": np.array([0.01671123]),
+    "i": np.array([-0.00001531]),
+    "node": np.array([0.0]),
+    "peri": np.array([102.93768193]),
+    "M0": np.array([100.46457166 - 102.93768193]),
+    "epoch": np.array([J2000_JD]),
+    "n": np.array([GAUSS_MEAN_MOTION / 1.00000261 ** 1.5]),
+}
+
+def orbital_elements(records: List[Dict]) -> Dict[str, np.ndarray]:
+    """Stack the orbital_data of NEO lookup records into one array per element"""
+    elements = {
+        key: np.array([float(r["orbital_data"][field]) for r in records], dtype=float)
+        for key, field in ORBIT_ELEMENT_FIELDS.items() if key != "n"
+    }
+    elements["n"] = np.array([
+        float(r["orbital_data"].get("mean_motion") or GAUSS_MEAN_MOTION / float(r["orbital_data"]["semi_major_axis"]) ** 1.5)
+        for r in records
+    ], dtype=float)
+    return elements
+
+def solve_kepler(M: np.ndarray, e: np.ndarray, tol: float = 1e-12, max_iter: int = 50) -> np.ndarray:
+    """Eccentric anomaly for every mean anomaly at once (Newton-Raphson, elliptic orbits)"""
+    E = np.where(e < 0.8, M, np.pi)
+    for _ in range(max_iter):
+        step = (E - e * np.sin(E) - M) / (1.0 - e * np.cos(E))
+        E -= step
+        if np.max(np.abs(step), initial=0.0) < tol:
+            break
+    return E
+
+def propagate_orbits(elements: Dict[str, np.ndarray], times_jd: np.ndarray) -> np.ndarray:
+    """Heliocentric ecliptic positions (AU) with shape (objects, steps, 3).
+
+    Every object is advanced to every time step in one batched computation: mean
+    anomalies form an objects x steps grid, Kepler's equation is solved over the
+    whole grid, and the perifocal coordinates are rotated by each orbit's angles.
+    """
+    e = elements["e"][:, None]
+    a = elements["a"][:, None]
+    M = np.radians(elements["M0"][:, None] + elements["n"][:, None] * (times_jd[None, :] - elements["epoch"][:, None]))
+    M = np.mod(M, 2 * np.pi)
+    E = solve_kepler(M, np.broadcast_to(e, M.shape))
+    
+    x_orb = a * (np.cos(E) - e)
+    y_orb = a * np.sqrt(1.0 - e ** 2) * np.sin(E)
+    
+    i, node, peri = (np.radians(elements[k])[:, None] for k in ("i", "node", "peri"))
+    cos_node, sin_node = np.cos(node), np.sin(node)
+    cos_peri, sin_peri = np.cos(peri), np.sin(peri)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+    
+    positions = np.empty(M.shape + (3,))
+    positions[..., 0] = x_orb * (cos_node * cos_peri - sin_node * sin_peri * cos_i) - y_orb * (cos_node * sin_peri + sin_node * cos_peri * cos_i)
+    positions[..., 1] = x_orb * (sin_node * cos_peri + cos_node * sin_peri * cos_i) + y_orb * (cos_node * cos_peri * cos_i - sin_node * sin_peri)
+    positions[..., 2] = x_orb * (sin_peri * sin_i) + y_orb * (cos_peri * sin_i)
+    return positions
+
+def benchmark_propagator(n_objects: int, n_steps: int, repeats: int = 3, seed: int = 0) -> Dict[str, float]:
+    """Best-of-N propagation throughput for random NEO-like orbits"""
+    rng = np.random.default_rng(seed)
+    a = rng.uniform(0.8, 3.0, n_objects)
+    elements = {
+        "a": a,
+        "e": rng.uniform(0.0, 0.9, n_objects),
+        "i": rng.uniform(0, 40, n_objects),
+        "node": rng.uniform(0, 360, n_objects),
+        "peri": rng.uniform(0, 360, n_objects),
+        "M0": rng.uniform(0, 360, n_objects),
+        "epoch": np.full(n_objects, 2460600.5),
+        "n": GAUSS_MEAN_MOTION / a ** 1.5,
+    }
+    times = 2460600.5 + np.linspace(0, 365.25, n_steps)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        propagate_orbits(elements, times)
+        best = min(best, time.perf_counter() - start)
+    return {
+        "objects": n_objects,
+        "steps": n_steps,
+        "seconds": best,
+        "object_steps_per_second": n_objects * n_steps / best,
+    }
+
+def fetch_orbit_records(nasa_api: NASAApiManager, neo_ids: List[str]) -> List[Dict]:
+    """Look up orbital elements for many objects concurrently, dropping any that fail"""
+    records = get_fetch_executor().map(nasa_api.get_neo_lookup, neo_ids)
+    return [r for r in records if r.get("orbital_data")]
+
+def render_orbit_view(nasa_api: NASAApiManager, df: pd.DataFrame, orders: Dict[str, np.ndarray]):
+    """Animated heliocentric view of the closest objects, driven by propagate_orbits"""
+    if is_stale_render():
+        st.caption("🪐 Orbit view loads once fresh NEO data arrives.")
+        return
+    
+    col_toggle, col_count, col_days, col_steps = st.columns([1, 1, 1, 1])
+    with col_toggle:
+        show = st.checkbox("Load orbits", key="orbit_view_enabled", help="Fetches orbital elements for each object (one request per object, cached)")
+    with col_count:
+        n_objects = st.slider("Objects", 5, 100, 25, key="orbit_view_objects")
+    with col_days:
+        span_days = st.slider("Time span (days)", 30, 730, 365, step=30, key="orbit_view_days")
+    with col_steps:
+        n_steps = st.select_slider("Frames", [30, 60, 120, 240], value=60, key="orbit_view_steps")
+    
+    if not show:
+        st.info("Enable **Load orbits** to propagate the closest objects around the Sun.")
+        return
+    
+    closest = df.iloc[orders["Distance (M km)"][:n_objects]]
+    with st.spinner("🛰️ Retrieving orbital elements..."):
+        records = fetch_orbit_records(nasa_api, closest["ID"].tolist())
+    if not records:
+        st.warning("Orbital elements are unavailable for the selected objects.")
+        return
+    
+    name_by_id = dict(zip(closest["ID"], closest["Name"]))
+    labels = [name_by_id.get(r.get("id"), r.get("name", "Unknown")) for r in records]
+    now_jd = time.time() / 86400.0 + 2440587.5
+    times = now_jd + np.linspace(0, span_days, n_steps)
+    
+    start = time.perf_counter()
+    positions = propagate_orbits(orbital_elements(records), times)
+    elapsed = time.perf_counter() - start
+    earth = propagate_orbits(EARTH_ELEMENTS, times)[0]
+    
+    # Trails for all objects share one trace, separated by gaps
+    gap = np.full((len(records), 1, 3), np.nan)
+    trails = np.concatenate([positions, gap], axis=1).reshape(-1, 3)
+    
+    def frame_traces(k: int):
+        return [
+            go.Scatter3d(x=[earth[k, 0]], y=[earth[k, 1]], z=[earth[k, 2]], mode="markers",
+                         marker=dict(size=6, color="#00aaff"), name="Earth"),
+            go.Scatter3d(x=positions[:, k, 0], y=positions[:, k, 1], z=positions[:, k, 2], mode="markers",
+                         marker=dict(size=4, color="#ff6600"), text=labels, name="NEOs",
+                         hovertemplate="<b>%{text}</b><br>x: %{x:.2f} AU<br>y: %{y:.2f} AU<br>z: %{z:.2f} AU"),
+        ]
+    
+    fig = go.Figure(
+        data=[
+            go.Scatter3d(x=[0], y=[0], z=[0], mode="markers", marker=dict(size=10, color="#ffcc00"), name="Sun"),
+            go.Scatter3d(x=earth[:, 0], y=earth[:, 1], z=earth[:, 2], mode="lines",
+                         line=dict(color="rgba(0, 170, 255, 0.5)", width=2), name="Earth orbit", hoverinfo="skip"),
+            go.Scatter3d(x=trails[:, 0], y=trails[:, 1], z=trails[:, 2], mode="lines",
+                         line=dict(color="rgba(255, 102, 0, 0.25)", width=1), name="NEO paths", hoverinfo="skip"),
+            *frame_traces(0),
+        ],
+        frames=[go.Frame(data=frame_traces(k), traces=[3, 4], name=str(k)) for k in range(n_steps)],
+    )
+    dates = [(datetime.today() + timedelta(days=float(d))).strftime("%Y-%m-%d") for d in times - now_jd]
+    fig.update_layout(
+        title="Heliocentric NEO Orbits",
+        scene=dict(
+            xaxis_title="x (AU)",
+            yaxis_title="y (AU)",
+            zaxis_title="z (AU)",
+            aspectmode="data",
+            bgcolor='rgba(0,0,0,0)'
+        ),
+        updatemenus=[dict(
+            type="buttons",
+            showactive=False,
+            buttons=[
+                dict(label="▶ Play", method="animate", args=[None, dict(frame=dict(duration=80, redraw=True), fromcurrent=True)]),
+                dict(label="⏸ Pause", method="animate", args=[[None], dict(frame=dict(duration=0, redraw=False), mode="immediate")]),
+            ],
+        )],
+        sliders=[dict(
+            steps=[dict(method="animate", label=dates[k], args=[[str(k)], dict(mode="immediate", frame=dict(duration=0, redraw=True))])
+                   for k in range(n_steps)],
+            currentvalue=dict(prefix="📅 "),
+        )],
+        template="plotly_dark",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#80d0ff'),
+        height=650
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(
+        f"⚡ Propagated {len(records)} objects × {n_steps} steps in {elapsed * 1000:.1f} ms "
+        f"({len(records) * n_steps / max(elapsed, 1e-9):,.0f} object-steps/s)"
+    )
+
+# ---------------------------
+# NEO CATALOG INGESTION
+# ---------------------------
+NEO_CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "neo_catalog")
+
+def project_neo_record(obj: Dict) -> Dict:
+    """The catalog columns of one browse record; close-approach history is dropped"""
+    orbit = obj.get("orbital_data", {})
+    meters = obj.get("estimated_diameter", {}).get("meters", {})
+    record = {
+        "id": obj.get("id", ""),
+        "name": obj.get("name", "Unknown"),
+        "h": obj.get("absolute_magnitude_h"),
+        "diameter_min_m": meters.get("estimated_diameter_min"),
+        "diameter_max_m": meters.get("estimated_diameter_max"),
+        "hazardous": bool(obj.get("is_potentially_hazardous_asteroid", False)),
+        "orbit_class": orbit.get("orbit_class", {}).get("orbit_class_type"),
+    }
+    # Keep the propagator's element names so catalog rows feed propagate_orbits directly
+    for key, field in ORBIT_ELEMENT_FIELDS.items():
+        value = orbit.get(field)
+        record[key] = float(value) if value not in (None, "") else None
+    return record
+
+def current_umask() -> int:
+    """The process umask, read without changing it where the platform allows"""
+    try:
+        with open("/proc/self/status") as f:  # Linux 4.7+
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    # os.umask can only be read by setting it, briefly affecting every thread
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+@contextmanager
+def atomic_output(path: str):
+    """Yield a unique temp path beside ``path``, moved into place if the block succeeds.
+
+    Concurrent writers of the same file each get their own temp file, so the
+    last ``os.replace`` simply wins. The file gets the usual permissions for a
+    new file rather than mkstemp's owner-only 0600, so a dashboard running as
+    another user can still read what ``ingest_catalog.py`` wrote.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, 0o666 & ~current_umask())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+class NEOCatalogIngester:
+    """Resumable, concurrent download of the full NEO catalog via the browse endpoint.
+
+    Every page is written to its own file the moment it arrives, so after a crash
+    or restart only the pages that never landed are fetched again. ``build`` merges
+    whatever pages exist into one compact columnar catalog file.
+    """
+    PAGE_SIZE = 20  # Largest page the browse endpoint serves
+    
+    def __init__(self, nasa_api: NASAApiManager, catalog_dir: str = NEO_CATALOG_DIR, workers: int = 4):
+        self.nasa_api = nasa_api
+        self.catalog_dir = catalog_dir
+        self.pages_dir = os.path.join(catalog_dir, "pages")
+        self.manifest_path = os.path.join(catalog_dir, "manifest.json")
+        self.catalog_path = os.path.join(catalog_dir, "catalog.parquet" if PARQUET_AVAILABLE else "catalog.csv")
+        self.workers = workers
+        self.running = False
+        self.pages_fetched = 0
+        self.pages_failed = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._manifest_lock = threading.Lock()  # Workers may all learn a new page count at once
+    
+    def _page_path(self, page: int) -> str:
+        return os.path.join(self.pages_dir, f"{page:05d}.json")
+    
+    def _write_json(self, path: str, data):
+        """Write atomically so an interrupted write never leaves a half page behind"""
+        with atomic_output(path) as tmp_path:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+    
+    def load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def completed_pages(self) -> set:
+        try:
+            return {int(name[:-5]) for name in os.listdir(self.pages_dir) if name.endswith(".json")}
+        except OSError:
+            return set()
+    
+    def pending_pages(self) -> List[int]:
+        total_pages = self.load_manifest().get("total_pages")
+        if total_pages is None:
+            return [0]
+        done = self.completed_pages()
+        return [page for page in range(total_pages) if page not in done]
+    
+    def _fetch_page(self, page: int) -> bool:
+        data = self.nasa_api.get_neo_browse_page(page, self.PAGE_SIZE)
+        if "near_earth_objects" not in data:
+            return False
+        if "page" in data:
+            with self._manifest_lock:
+                manifest = self.load_manifest()
+                if manifest.get("total_pages") != data["page"].get("total_pages"):
+                    self._write_json(self.manifest_path, {
+                        "page_size": self.PAGE_SIZE,
+                        "total_pages": data["page"].get("total_pages"),
+                        "total_elements": data["page"].get("total_elements"),
+                    })
+        self._write_json(self._page_path(page), [project_neo_record(obj) for obj in data["near_earth_objects"]])
+        return True
+    
+    def _fetch_page_safely(self, page: int) -> bool:
+        """Fetch one page, counting any error (e.g. a full disk) as a failed page to retry next run"""
+        try:
+            return self._fetch_page(page)
+        except Exception:
+            return False
+    
+    def run(self, max_pages: Optional[int] = None) -> int:
+        """Fetch missing pages within the remaining hourly budget; returns pages written"""
+        os.makedirs(self.pages_dir, exist_ok=True)
+        self.running = True
+        self._stop.clear()
+        written = 0
+        try:
+            # The first page tells us how many pages there are
+            if self.load_manifest().get("total_pages") is None:
+                if not self._fetch_page_safely(0):
+                    self.pages_failed += 1
+                    return written
+                written += 1
+                self.pages_fetched += 1
+            
+            pending = self.pending_pages()
+            budget = self.nasa_api.remaining_requests()
+            pending = pending[:min(budget, max_pages - written if max_pages is not None else budget)]
+            
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="neo-ingest") as pool:
+                futures = {pool.submit(self._fetch_page_safely, page): page for page in pending}
+                for future in as_completed(futures):
+                    if future.result():
+                        written += 1
+                        self.pages_fetched += 1
+                    else:
+                        self.pages_failed += 1
+                    if self._stop.is_set():
+                        for other in futures:
+                            other.cancel()
+                        break
+            return written
+        finally:
+            self.build()
+            self.running = False
+    
+    def start(self) -> bool:
+        """Run in a background thread; False if a run is already in progress"""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        self._thread = threading.Thread(target=self.run, name="neo-catalog-ingest", daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self):
+        self._stop.set()
+    
+    def build(self) -> Optional[pd.DataFrame]:
+        """Merge every checkpointed page into the catalog file"""
+        rows = []
+        for page in sorted(self.completed_pages()):
+            with open(self._page_path(page)) as f:
+                rows.extend(json.load(f))
+        if not rows:
+            return None
+        catalog = pd.DataFrame(rows).drop_duplicates("id").reset_index(drop=True)
+        with atomic_output(self.catalog_path) as tmp_path:
+            if PARQUET_AVAILABLE:
+                catalog.to_parquet(tmp_path, index=False)
+            else:
+                catalog.to_csv(tmp_path, index=False)
+        return catalog
+    
+    def status(self) -> Dict:
+        manifest = self.load_manifest()
+        return {
+            "running": self.running,
+            "pages_done": len(self.completed_pages()),
+            "total_pages": manifest.get("total_pages"),
+            "total_elements": manifest.get("total_elements"),
+            "pages_failed": self.pages_failed,
+        }
+
+@st.cache_resource(show_spinner=False)
+def get_catalog_ingester(api_key: str) -> NEOCatalogIngester:
+    """One ingester per key, so a background run outlives the rerun that started it"""
+    return NEOCatalogIngester(get_nasa_api(api_key))
+
+@st.cache_data(show_spinner=False, max_entries=2)
+def load_neo_catalog(path: str, mtime: float) -> pd.DataFrame:
+    """Read the catalog file; ``mtime`` keys the cache so a rebuilt catalog is reloaded"""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={"id": str})
+
 # ---------------------------
 # DASHBOARD COMPONENTS
 # ---------------------------
 def create_space_header():
-    """Create animated header with sci-fi effects"""
+    """Create animated header with sci-fi effects; its styles and clock come with the theme"""
     col1, col2, col3 = st.columns([1, 3, 1])
     with col2:
         st.markdown("""
-        <div style="text-align: center; margin-bottom: 2rem; padding: 20px; background: rgba(0, 30, 60, 0.2); border-radius: 15px; border: 1px solid rgba(0, 170, 255, 0.3);">
-            <h1 style="font-size: 3.5rem; margin-bottom: 0.5rem; background: linear-gradient(90deg, #00e6ff, #00a2ff); -webkit-background-clip: text; -webkit-text-fill-color: transparent;">🚀 NASA COSMIC DASHBOARD</h1>
-            <p style="font-family: 'Exo 2', sans-serif; color: #80d0ff; font-size: 1.2rem;">
-                Real-time Space Exploration Interface | Stardate: <span id="stardate"></span>
-            </p>
-            <div style="height: 3px; background: linear-gradient(90deg, transparent, #00aaff, transparent); margin: 10px 0;"></div>
-            <p style="font-family: 'Exo 2', sans-serif; color: #a0d0ff; font-size: 0.9rem; margin-top: 10px;">
-                Powered by NASA Open APIs | Data updates every 30 minutes
-            </p>
+        <div class="space-header">
+            <h1>🚀 NASA COSMIC DASHBOARD</h1>
+            <p>Real-time Space Exploration Interface | Stardate: <span class="stardate"></span></p>
+            <div class="space-header-divider"></div>
+            <p class="space-header-note">Powered by NASA Open APIs | Data updates every 30 minutes</p>
         </div>
-        
-        <script>
-        // Calculate stardate (just for fun)
-        function calculateStardate() {
-            const now = new Date();
-            const year = now.getFullYear();
-            const dayOfYear = Math.floor((now - new Date(year, 0, 0)) / (1000 * 60 * 60 * 24));
-            const hourFraction = now.getHours() / 24;
-            const stardate = (year + (dayOfYear + hourFraction) / 365).toFixed(4);
-            document.getElementById('stardate').textContent = stardate;
-        }
-        calculateStardate();
-        setInterval(calculateStardate, 60000);
-        </script>
         """, unsafe_allow_html=True)
 
-def create_apod_section(nasa_api: NASAApiManager):
+def create_apod_section(nasa_api: NASAApiManager, pending: Optional[List] = None):
     """Enhanced Astronomy Picture of the Day section"""
     st.markdown("## 📡 Astronomy Picture of the Day")
     
-    with st.spinner("🛰️ Downloading cosmic image from deep space...") as spinner:
-        apod_data = nasa_api.get_apod()
-    
+    load_section(
+        nasa_api, "apod_today", nasa_api.get_apod, render_apod,
+        "🛰️ Downloading cosmic image from deep space...", pending
+    )
+
+def render_apod(apod_data: Dict):
+    """Draw the APOD image and its details"""
     col1, col2 = st.columns([2, 1])
     
     with col1:
@@ -455,7 +1861,8 @@ def create_apod_section(nasa_api: NASAApiManager):
         with col_c:
             st.metric("📡 Source", "Hubble", "Space Telescope")
 
-def create_neo_dashboard(nasa_api: NASAApiManager):
+@rerunnable_section
+def create_neo_dashboard(nasa_api: NASAApiManager, pending: Optional[List] = None):
     """Enhanced Near Earth Object tracking dashboard"""
     st.markdown("## ☄️ Near Earth Object Tracker")
     
@@ -468,27 +1875,49 @@ def create_neo_dashboard(nasa_api: NASAApiManager):
     with col_controls[2]:
         show_hazardous = st.checkbox("Show only hazardous", value=False)
     
-    with st.spinner("🛰️ Scanning for near-Earth objects...") as spinner:
-        neo_data = nasa_api.get_neo_feed(days)
+    # Range filters, answered from the NEO index
+    with st.expander("🎚️ More filters"):
+        col_dist, col_speed, col_dates = st.columns(3)
+        with col_dist:
+            distance = st.slider("Miss distance (M km)", 0.0, NEO_MAX_DISTANCE_MKM, (0.0, NEO_MAX_DISTANCE_MKM), step=0.5)
+        with col_speed:
+            speed = st.slider("Speed (km/s)", 0.0, NEO_MAX_SPEED_KMS, (0.0, NEO_MAX_SPEED_KMS), step=0.5)
+        with col_dates:
+            today = datetime.today().date()
+            feed_start = today - timedelta(days=days)
+            dates = st.date_input("Approach dates", (feed_start, today), min_value=feed_start, max_value=today)
     
-    # Extract and format NEO data
-    neo_list = []
-    for date, objects in neo_data.get("near_earth_objects", {}).items():
-        for obj in objects:
-            size = obj.get("estimated_diameter", {}).get("meters", {}).get("estimated_diameter_max", 0)
-            if size >= min_size:
-                if not show_hazardous or obj.get("is_potentially_hazardous_asteroid", False):
-                    neo_list.append({
-                        "Date": date,
-                        "Name": obj.get("name", "Unknown"),
-                        "Size (m)": size,
-                        "Distance (M km)": float(obj.get("close_approach_data", [{}])[0].get("miss_distance", {}).get("kilometers", 0)) / 1e6,
-                        "Speed (km/s)": float(obj.get("close_approach_data", [{}])[0].get("relative_velocity", {}).get("kilometers_per_second", 0)),
-                        "Hazardous": "⚠️ DANGER" if obj.get("is_potentially_hazardous_asteroid", False) else "✅ SAFE"
-                    })
+    filters = {
+        "size": (min_size, None),
+        # The top of each slider means "no upper bound"
+        "distance": (distance[0] * 1e6, distance[1] * 1e6 if distance[1] < NEO_MAX_DISTANCE_MKM else None),
+        "speed": (speed[0], speed[1] if speed[1] < NEO_MAX_SPEED_KMS else None),
+        "date": (dates[0], dates[-1]) if dates else (None, None),
+        "hazardous_only": show_hazardous,
+    }
+    
+    load_section(
+        nasa_api, f"neo_{days}days",
+        lambda: nasa_api.get_neo_feed(days),
+        lambda neo_data: render_neo_data(nasa_api, neo_data, days, filters),
+        "🛰️ Scanning for near-Earth objects...", pending
+    )
+
+def render_neo_data(nasa_api: NASAApiManager, neo_data: Dict, days: int, filters: Dict):
+    """Filter the NEO feed and draw metrics, charts and the object table"""
+    with timed_section("NEO › index & filter"):
+        index = get_neo_index(neo_data)
+        positions = index.query(
+            size=filters["size"],
+            distance=filters["distance"],
+            speed=filters["speed"],
+            date=filters["date"],
+            hazardous_only=filters["hazardous_only"],
+        )
     
-    if neo_list:
-        df = pd.DataFrame(neo_list)
+    if len(positions):
+        df = index.to_frame(positions)
+        orders = index.frame_orders(positions)
         
         # Enhanced metrics with icons
         col1, col2, col3, col4 = st.columns(4)
@@ -507,7 +1936,7 @@ def create_neo_dashboard(nasa_api: NASAApiManager):
         style_metric_cards()
         
         # Enhanced visualization tabs
-        tab1, tab2, tab3, tab4 = st.tabs(["📊 3D Overview", "🌍 Close Approaches", "📈 Size Analysis", "📋 Object Data"])
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 3D Overview", "🪐 Orbit View", "🌍 Close Approaches", "📈 Size Analysis", "📋 Object Data"])
         
         with tab1:
             fig = go.Figure(data=[
@@ -545,7 +1974,10 @@ def create_neo_dashboard(nasa_api: NASAApiManager):
             st.plotly_chart(fig, use_container_width=True)
         
         with tab2:
-            closest_objects = df.sort_values("Distance (M km)").head(15)
+            render_orbit_view(nasa_api, df, orders)
+        
+        with tab3:
+            closest_objects = index.to_frame(index.nearest(15, positions))
             fig = px.bar(
                 closest_objects,
                 x="Name",
@@ -564,7 +1996,7 @@ def create_neo_dashboard(nasa_api: NASAApiManager):
             )
             st.plotly_chart(fig, use_container_width=True)
         
-        with tab3:
+        with tab4:
             col1, col2 = st.columns(2)
             with col1:
                 fig = px.histogram(
@@ -596,55 +2028,343 @@ def create_neo_dashboard(nasa_api: NASAApiManager):
                 )
                 st.plotly_chart(fig, use_container_width=True)
         
-        with tab4:
-            # Enhanced data table
-            st.dataframe(
-                df.sort_values("Distance (M km)"),
-                column_config={
-                    "Date": st.column_config.DateColumn("📅 Date"),
-                    "Name": st.column_config.TextColumn("🪐 Name"),
-                    "Size (m)": st.column_config.NumberColumn("📏 Size (m)", format="%.0f m"),
-                    "Distance (M km)": st.column_config.NumberColumn("🌍 Distance (M km)", format="%.2f"),
-                    "Speed (km/s)": st.column_config.NumberColumn("⚡ Speed (km/s)", format="%.1f"),
-                    "Hazardous": st.column_config.TextColumn("⚠️ Status")
-                },
-                hide_index=True,
-                use_container_width=True,
-                height=400
-            )
+        with tab5, timed_section("NEO › table"):
+            render_neo_table(df, orders)
     else:
         st.info("No near-Earth objects found for the selected criteria.")
 
-def create_mars_section(nasa_api: NASAApiManager):
+# ---------------------------
+# NEO DATA TABLE
+# ---------------------------
+NEO_SORT_COLUMNS = ["Distance (M km)", "Size (m)", "Speed (km/s)", "Date", "Name"]
+NEO_PAGE_SIZES = [25, 50, 100, 250]
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+def neo_table_order(df: pd.DataFrame, orders: Dict[str, np.ndarray], sort_by: str,
+                    descending: bool, name_filter: str, status: str) -> np.ndarray:
+    """Row positions of the filtered table in display order, taken from the pre-sorted index"""
+    order = orders[sort_by]
+    if descending:
+        order = order[::-1]
+    
+    mask = np.ones(len(df), dtype=bool)
+    if name_filter:
+        mask &= df["Name"].str.contains(name_filter, case=False, regex=False).to_numpy()
+    if status != "All":
+        mask &= (df["Hazardous"] == status).to_numpy()
+    return order[mask[order]]
+
+def export_neo_table(df: pd.DataFrame, order: np.ndarray, fmt: str) -> bytes:
+    """Encode the full filtered table for download.
+
+    st.download_button takes the whole payload as bytes, so the file is built in
+    memory; it is only built when an export is requested.
+    """
+    if fmt == "Parquet":
+        buffer = io.BytesIO()
+        df.iloc[order].to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    return df.iloc[order].to_csv(index=False).encode("utf-8")
+
+def render_neo_table(df: pd.DataFrame, orders: Dict[str, np.ndarray]):
+    """Paginated object table; sorting, filtering and slicing happen server-side"""
+    interactive = not is_stale_render()
+    state = st.session_state
+    
+    if interactive:
+        col_sort, col_dir, col_filter, col_status, col_size = st.columns([2, 1, 2, 1, 1])
+        with col_sort:
+            st.selectbox("Sort by", NEO_SORT_COLUMNS, key="neo_table_sort")
+        with col_dir:
+            st.checkbox("Descending", key="neo_table_desc")
+        with col_filter:
+            st.text_input("Filter by name", key="neo_table_filter", placeholder="e.g. 2024")
+        with col_status:
+            st.selectbox("Status", ["All", "⚠️ DANGER", "✅ SAFE"], key="neo_table_status")
+        with col_size:
+            st.selectbox("Rows per page", NEO_PAGE_SIZES, key="neo_table_page_size")
+    
+    order = neo_table_order(
+        df,
+        orders,
+        state.get("neo_table_sort", NEO_SORT_COLUMNS[0]),
+        state.get("neo_table_desc", False),
+        state.get("neo_table_filter", ""),
+        state.get("neo_table_status", "All"),
+    )
+    page_size = state.get("neo_table_page_size", NEO_PAGE_SIZES[0])
+    n_pages = max(1, -(-len(order) // page_size))
+    if state.get("neo_table_page", 1) > n_pages:
+        state["neo_table_page"] = n_pages
+    
+    if interactive:
+        col_page, col_info = st.columns([1, 3])
+        with col_page:
+            page = st.number_input("Page", min_value=1, max_value=n_pages, key="neo_table_page")
+    else:
+        page = state.get("neo_table_page", 1)
+    
+    start = (page - 1) * page_size
+    page_df = df.iloc[order[start:start + page_size]]
+    
+    # Enhanced data table
+    st.dataframe(
+        page_df,
+        column_config={
+            "ID": None,
+            "Date": st.column_config.DateColumn("📅 Date"),
+            "Name": st.column_config.TextColumn("🪐 Name"),
+            "Size (m)": st.column_config.NumberColumn("📏 Size (m)", format="%.0f m"),
+            "Distance (M km)": st.column_config.NumberColumn("🌍 Distance (M km)", format="%.2f"),
+            "Speed (km/s)": st.column_config.NumberColumn("⚡ Speed (km/s)", format="%.1f"),
+            "Hazardous": st.column_config.TextColumn("⚠️ Status")
+        },
+        hide_index=True,
+        use_container_width=True,
+        height=400
+    )
+    st.caption(f"Showing {min(start + 1, len(order))}–{min(start + page_size, len(order))} of {len(order)} objects · page {page} of {n_pages}")
+    
+    if not interactive:
+        return
+    
+    # Export the full filtered result, encoded only when requested
+    formats = ["CSV", "Parquet"] if PARQUET_AVAILABLE else ["CSV"]
+    col_fmt, col_export = st.columns([1, 3])
+    with col_fmt:
+        fmt = st.radio("Export format", formats, horizontal=True, key="neo_table_export_format")
+    with col_export:
+        if st.button("📦 Prepare export", key="neo_table_export"):
+            st.download_button(
+                f"⬇️ Download {len(order)} objects ({fmt})",
+                data=export_neo_table(df, order, fmt),
+                file_name=f"neo_objects.{fmt.lower()}",
+                mime="application/vnd.apache.parquet" if fmt == "Parquet" else "text/csv",
+                key="neo_table_download"
+            )
+
+def create_neo_catalog_section(nasa_api: NASAApiManager):
+    """Full NEO catalog: background ingestion controls and instant local search"""
+    st.markdown("## 📚 NEO Catalog")
+    ingester = get_catalog_ingester(nasa_api.api_keys)
+    status = ingester.status()
+    
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        st.metric("📄 Pages", f"{status['pages_done']:,}", f"of {status['total_pages']:,}" if status["total_pages"] else "unknown")
+    with col2:
+        st.metric("🪐 Catalog Size", f"{status['total_elements']:,}" if status["total_elements"] else "—")
+    with col3:
+        if status["running"]:
+            if st.button("⏹️ Stop ingestion", use_container_width=True):
+                ingester.stop()
+        elif st.button("📥 Start / resume ingestion", use_container_width=True):
+            ingester.start()
+            st.rerun()
+    with col4:
+        st.metric("📡 Budget Left", f"{nasa_api.remaining_requests():,}", "requests/hour")
+    
+    if status["total_pages"]:
+        st.progress(status["pages_done"] / status["total_pages"], text="Ingesting..." if status["running"] else "Idle — resumes where it stopped")
+    
+    if not os.path.exists(ingester.catalog_path):
+        st.info("No local catalog yet. Start ingestion to download the full NEO catalog.")
+        return
+    
+    catalog = load_neo_catalog(ingester.catalog_path, os.path.getmtime(ingester.catalog_path))
+    col_name, col_haz, col_h = st.columns([2, 1, 1])
+    with col_name:
+        query = st.text_input("Search catalog by name or id", key="catalog_query")
+    with col_haz:
+        hazardous_only = st.checkbox("Hazardous only", key="catalog_hazardous")
+    with col_h:
+        max_h = st.number_input("Max magnitude (H)", 10.0, 35.0, 35.0, step=0.5, key="catalog_max_h")
+    
+    mask = catalog["h"].fillna(99).to_numpy() <= max_h
+    if hazardous_only:
+        mask &= catalog["hazardous"].to_numpy()
+    if query:
+        mask &= (
+            catalog["name"].str.contains(query, case=False, regex=False).to_numpy()
+            | (catalog["id"].astype(str) == query).to_numpy()
+        )
+    matches = catalog[mask]
+    st.caption(f"{len(matches):,} of {len(catalog):,} catalogued objects match")
+    st.dataframe(
+        matches.head(200)[["id", "name", "h", "diameter_max_m", "hazardous", "orbit_class", "a", "e", "i"]],
+        column_config={
+            "id": st.column_config.TextColumn("🆔 ID"),
+            "name": st.column_config.TextColumn("🪐 Name"),
+            "h": st.column_config.NumberColumn("✨ H", format="%.1f"),
+            "diameter_max_m": st.column_config.NumberColumn("📏 Max Size (m)", format="%.0f"),
+            "hazardous": st.column_config.CheckboxColumn("⚠️ Hazardous"),
+            "orbit_class": st.column_config.TextColumn("🛰️ Class"),
+            "a": st.column_config.NumberColumn("a (AU)", format="%.3f"),
+            "e": st.column_config.NumberColumn("e", format="%.3f"),
+            "i": st.column_config.NumberColumn("i (°)", format="%.1f"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        height=400
+    )
+
+def mars_photo_sols(manifest: Dict, camera: str = "ALL") -> List[int]:
+    """Sols, in order, on which the manifest lists photos for the camera"""
+    return [
+        entry["sol"] for entry in manifest.get("photos", [])
+        if entry.get("total_photos") and (camera == "ALL" or camera in entry.get("cameras", []))
+    ]
+
+def _step_mars_sol(nasa_api: NASAApiManager, rover: str, camera: str, direction: int):
+    """Button callback: jump to the previous/next sol with photos, per the cached manifest"""
+    manifest, _ = nasa_api.peek(f"mars_manifest_{rover.lower()}")
+    sol = st.session_state["mars_sol"]
+    sols = mars_photo_sols(manifest, camera) if manifest else []
+    if not sols:
+        st.session_state["mars_sol"] = max(0, sol + direction)
+        return
+    pos = bisect.bisect_right(sols, sol) if direction > 0 else bisect.bisect_left(sols, sol) - 1
+    if 0 <= pos < len(sols):
+        st.session_state["mars_sol"] = sols[pos]
+
+def prefetch_mars_sols(nasa_api: NASAApiManager, rover: str, camera: str, sol: int, manifest: Dict):
+    """Warm the photo cache for the neighbouring sols with photos, in the background"""
+    sols = mars_photo_sols(manifest, camera) if manifest else []
+    if sols:
+        pos = bisect.bisect_left(sols, sol)
+        neighbours = sols[max(0, pos - MARS_PREFETCH_SOLS):pos] + [s for s in sols[pos:pos + MARS_PREFETCH_SOLS + 1] if s != sol]
+    else:
+        neighbours = [s for s in range(sol - MARS_PREFETCH_SOLS, sol + MARS_PREFETCH_SOLS + 1) if s >= 0 and s != sol]
+    executor = get_fetch_executor()
+    for neighbour in neighbours:
+        _, fresh = nasa_api.peek(f"mars_photos_{rover.lower()}_{neighbour}_{camera}")
+        if not fresh:
+            executor.submit(nasa_api.get_mars_photos, rover, neighbour, camera)
+
+@rerunnable_section
+def create_mars_section(nasa_api: NASAApiManager, pending: Optional[List] = None):
     """Enhanced Mars Rover Photos section"""
     st.markdown("## 🔴 Mars Rover Reconnaissance")
     
     # Rover selection with more options
-    rovers = ["Curiosity", "Perseverance", "Opportunity", "Spirit"]
+    rovers = list(MARS_ROVER_CAMERAS)
     col_select = st.columns([2, 1, 1])
     with col_select[0]:
         selected_rover = st.selectbox("Select Rover", rovers, index=0)
+    
+    # Progressive mode never waits on the manifest: use it once it is cached
+    manifest_endpoint = f"mars_manifest_{selected_rover.lower()}"
+    if pending is None:
+        manifest = nasa_api.get_mars_manifest(selected_rover)
+    else:
+        manifest, fresh = nasa_api.peek(manifest_endpoint)
+        if not fresh:
+            get_fetch_executor().submit(nasa_api.get_mars_manifest, selected_rover)
+        manifest = manifest or {}
+    
+    max_sol = manifest.get("max_sol", MARS_MAX_SOL)
+    st.session_state.setdefault("mars_sol", 2987)
+    if st.session_state["mars_sol"] > max_sol:
+        st.session_state["mars_sol"] = max_sol
     with col_select[1]:
-        sol = st.number_input("Martian Sol", 0, 4000, 2987)
+        sol = st.number_input("Martian Sol", 0, max_sol, key="mars_sol")
     with col_select[2]:
-        camera = st.selectbox("Camera", ["MAST", "NAVCAM", "CHEMCAM", "PANCAM"])
+        camera = st.selectbox("Camera", ["ALL"] + MARS_ROVER_CAMERAS[selected_rover])
+    
+    col_prev, col_next, col_hint = st.columns([1, 1, 3])
+    with col_prev:
+        st.button("⏮️ Previous sol", on_click=_step_mars_sol, args=(nasa_api, selected_rover, camera, -1), use_container_width=True)
+    with col_next:
+        st.button("⏭️ Next sol", on_click=_step_mars_sol, args=(nasa_api, selected_rover, camera, 1), use_container_width=True)
+    with col_hint:
+        if manifest:
+            st.caption(f"Steps skip sols without {camera if camera != 'ALL' else 'any'} photos, using the mission manifest.")
+    
+    sol_entry = next((entry for entry in manifest.get("photos", []) if entry["sol"] == sol), {})
     
     # Enhanced Mars metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("🪐 Sol", f"{sol}", "+1")
+        st.metric("🪐 Sol", f"{sol}", f"of {max_sol}" if manifest else None)
     with col2:
-        st.metric("🌡️ Temperature", "-63°C", "-2°C")
+        st.metric("📅 Earth Date", sol_entry.get("earth_date", "—"))
     with col3:
-        st.metric("📸 Photos Taken", "857,423", "+124")
+        st.metric("📸 Photos This Sol", f"{sol_entry.get('total_photos', 0):,}" if manifest else "—")
     with col4:
-        st.metric("🛤️ Distance Traveled", "28.2 km", "+0.1 km")
+        st.metric("🛰️ Mission Photos", f"{manifest['total_photos']:,}" if manifest.get("total_photos") else "—", manifest.get("status", "").title() or None)
+    
+    load_section(
+        nasa_api, f"mars_photos_{selected_rover.lower()}_{sol}_{camera}",
+        lambda: nasa_api.get_mars_photos(selected_rover, sol, camera),
+        lambda photo_data: render_mars_photos(photo_data, selected_rover, sol, camera),
+        "🛰️ Downlinking rover imagery...", pending
+    )
+    prefetch_mars_sols(nasa_api, selected_rover, camera, sol, manifest)
     
     # Get EPIC Earth images
     st.markdown("#### 🌍 Earth from Space (EPIC)")
-    epic_data = nasa_api.get_epic_images()
+    load_section(
+        nasa_api, "epic_images", nasa_api.get_epic_images,
+        lambda epic_data: render_epic_images(epic_data, nasa_api.api_key, selected_rover, sol, camera),
+        "🛰️ Receiving images from DSCOVR...", pending
+    )
+    create_epic_timelapse(nasa_api, pending)
+
+def render_mars_photos(photo_data: Dict, selected_rover: str, sol: int, camera: str):
+    """Grid of rover photos for the selected sol and camera"""
+    photos = photo_data.get("photos", [])
+    if not photos:
+        st.info(f"No {selected_rover} photos for sol {sol} ({camera}). Use ⏭️ Next sol to jump to one with images.")
+        return
+    
+    count = f"{len(photos)}+" if photo_data.get("partial") else f"{len(photos)}"
+    st.markdown(f"#### 🪐 {selected_rover} · Sol {sol} · {count} photos")
+    cols = st.columns(4)
+    for idx, photo in enumerate(photos[:MARS_PHOTOS_SHOWN]):
+        with cols[idx % 4]:
+            st.image(
+                photo["img_src"],
+                caption=f"{photo.get('camera', {}).get('full_name', camera)} | {photo.get('earth_date', '')}",
+                use_column_width=True
+            )
+
+def create_epic_timelapse(nasa_api: NASAApiManager, pending: Optional[List] = None):
+    """Full-day Earth time-lapse for any EPIC date, played from the disk cache"""
+    st.markdown("#### 🎞️ Earth Time-lapse (EPIC)")
+    
+    # Progressive mode never waits on the date index: use it once it is cached
+    if pending is None:
+        dates = nasa_api.get_epic_dates()
+    else:
+        dates, fresh = nasa_api.peek("epic_dates")
+        if not fresh:
+            get_fetch_executor().submit(nasa_api.get_epic_dates)
+        dates = dates or []
+    if not dates:
+        st.info("EPIC date index is loading or unavailable.")
+        return
+    
+    col_date, col_size, col_build = st.columns([2, 1, 1])
+    with col_date:
+        date = st.selectbox("Date", dates[::-1], key="epic_timelapse_date")
+    with col_size:
+        size = st.selectbox("Frame size (px)", EPIC_FRAME_SIZES, index=1, key="epic_timelapse_size")
+    path = epic_timelapse_path(date, size)
+    with col_build:
+        if not os.path.exists(path) and st.button("🎬 Build time-lapse", use_container_width=True):
+            with st.spinner(f"🛰️ Downloading and encoding every frame from {date}..."):
+                path = build_epic_timelapse(nasa_api, date, size)
+            if path is None:
+                st.warning(f"No EPIC frames could be retrieved for {date}.")
     
+    if path and os.path.exists(path):
+        st.image(path, caption=f"Earth | {date} | full-day time-lapse")
+    else:
+        st.caption("Time-lapses are encoded once per date and size, then replayed from disk.")
+
+def render_epic_images(epic_data: Dict, api_key: str, selected_rover: str, sol: int, camera: str):
+    """Draw the EPIC Earth images, or rover fallbacks when none are available"""
     if epic_data["images"]:
         cols = st.columns(4)
         for idx, col in enumerate(cols):
@@ -652,7 +2372,7 @@ def create_mars_section(nasa_api: NASAApiManager):
                 with col:
                     image = epic_data["images"][idx]
                     date = image.get("date", "").split(" ")[0]
-                    image_url = f"https://api.nasa.gov/EPIC/archive/natural/{date.replace('-', '/')}/png/{image['image']}.png?api_key={nasa_api.api_key}"
+                    image_url = f"https://api.nasa.gov/EPIC/archive/natural/{date.replace('-', '/')}/png/{image['image']}.png?api_key={api_key}"
                     st.image(
                         image_url,
                         caption=f"Earth | {date}",
@@ -677,13 +2397,18 @@ def create_mars_section(nasa_api: NASAApiManager):
                     use_column_width=True
                 )
 
-def create_space_weather(nasa_api: NASAApiManager):
+def create_space_weather(nasa_api: NASAApiManager, pending: Optional[List] = None):
     """Enhanced Space weather monitoring section"""
     st.markdown("## 🌞 Space Weather Station")
     
     # Get real DONKI alerts
-    donki_data = nasa_api.get_donki_alerts()
-    
+    load_section(
+        nasa_api, "donki_alerts", nasa_api.get_donki_alerts, render_space_weather,
+        "🛰️ Polling space weather notifications...", pending
+    )
+
+def render_space_weather(donki_data: Dict):
+    """Draw the solar activity gauge, current alerts and event table"""
     col1, col2 = st.columns([2, 1])
     
     with col1:
@@ -770,6 +2495,29 @@ def create_space_weather(nasa_api: NASAApiManager):
         use_container_width=True
     )
 
+@st.fragment
+def create_mission_status():
+    """Mission status selector; changing it reruns only this panel"""
+    mission_status = st.select_slider(
+        "System Status",
+        options=["STANDBY", "ACTIVE", "HIGH ALERT", "EMERGENCY"],
+        value="ACTIVE"
+    )
+    
+    # Color indicator based on status
+    status_colors = {
+        "STANDBY": "#00ccff",
+        "ACTIVE": "#00ff00",
+        "HIGH ALERT": "#ff9900",
+        "EMERGENCY": "#ff0000"
+    }
+    
+    st.markdown(f"""
+    <div style="background: rgba(0, 0, 0, 0.3); padding: 15px; border-radius: 10px; border: 2px solid {status_colors[mission_status]}; text-align: center;">
+        <h4 style="margin: 0; color: {status_colors[mission_status]}; text-shadow: 0 0 10px {status_colors[mission_status]};">{mission_status}</h4>
+    </div>
+    """, unsafe_allow_html=True)
+
 def create_sidebar():
     """Enhanced sci-fi themed sidebar"""
     with st.sidebar:
@@ -784,14 +2532,17 @@ def create_sidebar():
         st.markdown("#### 🔑 API Configuration")
         api_key = st.text_input(
             "NASA API Key",
-            value="edqgehWUnpy6gPJd0JJFcRyv5SjfIRCPfdoGWqu4",
+            value=os.environ.get("NASA_API_KEYS", "edqgehWUnpy6gPJd0JJFcRyv5SjfIRCPfdoGWqu4"),
             type="password",
-            help="Your NASA API key for enhanced access"
+            help="Your NASA API key for enhanced access. Separate several keys with commas to pool their hourly budgets."
         )
         
         # API status indicator
+        key_count = len(parse_api_keys(api_key))
         if api_key == "DEMO_KEY":
             st.warning("Using DEMO_KEY (rate limited)")
+        elif key_count > 1:
+            st.success(f"✅ Pooling {key_count} API keys")
         elif api_key:
             st.success("✅ Using your API key")
         
@@ -799,25 +2550,7 @@ def create_sidebar():
         
         # Mission control
         st.markdown("#### 🎛️ Mission Control")
-        mission_status = st.select_slider(
-            "System Status",
-            options=["STANDBY", "ACTIVE", "HIGH ALERT", "EMERGENCY"],
-            value="ACTIVE"
-        )
-        
-        # Color indicator based on status
-        status_colors = {
-            "STANDBY": "#00ccff",
-            "ACTIVE": "#00ff00",
-            "HIGH ALERT": "#ff9900",
-            "EMERGENCY": "#ff0000"
-        }
-        
-        st.markdown(f"""
-        <div style="background: rgba(0, 0, 0, 0.3); padding: 15px; border-radius: 10px; border: 2px solid {status_colors[mission_status]}; text-align: center;">
-            <h4 style="margin: 0; color: {status_colors[mission_status]}; text-shadow: 0 0 10px {status_colors[mission_status]};">{mission_status}</h4>
-        </div>
-        """, unsafe_allow_html=True)
+        create_mission_status()
         
         st.markdown("---")
         
@@ -825,6 +2558,12 @@ def create_sidebar():
         st.markdown("#### 🔄 Data Refresh")
         auto_refresh = st.checkbox("Auto-refresh", value=True)
         refresh_rate = st.slider("Refresh interval (minutes)", 5, 120, 30, disabled=not auto_refresh)
+        st.checkbox(
+            "⚡ Progressive rendering",
+            value=True,
+            key="progressive_mode",
+            help="Show cached data immediately and fill in sections as fresh data arrives"
+        )
         
         col_refresh = st.columns(2)
         with col_refresh[0]:
@@ -833,9 +2572,18 @@ def create_sidebar():
         with col_refresh[1]:
             if st.button("🗑️ Clear Cache", use_container_width=True):
                 st.cache_data.clear()
+                get_nasa_api.clear()
                 st.success("Cache cleared!")
                 st.rerun()
         
+        if is_admin():
+            st.button(
+                "🧪 Profile this rerun",
+                use_container_width=True,
+                on_click=lambda: st.session_state.update(profile_requested=True),
+                help="Run the next rerun under the CPU profiler and allocation tracer"
+            )
+        
         st.markdown("---")
         
         # Dashboard info
@@ -846,35 +2594,64 @@ def create_sidebar():
         <p><b>📡 API Requests:</b> Optimized</p>
         <p><b>⏰ Last Update:</b> Just now</p>
         <p><b>🔧 Data Source:</b> NASA APIs</p>
-        <p><b>⚡ Cache Duration:</b> 30 min</p>
+        <p><b>⚡ Cache:</b> Calendar-aware</p>
         </div>
         """, unsafe_allow_html=True)
         
         return api_key
 
+def render_key_usage(nasa_api: NASAApiManager):
+    """Per-key request budgets of the API key pool"""
+    status_icons = {"active": "🟢 Active", "exhausted": "🟡 Exhausted", "invalid": "🔴 Invalid"}
+    usage = pd.DataFrame(nasa_api.key_pool.usage())
+    usage["Status"] = usage["Status"].map(status_icons)
+    
+    st.markdown("---")
+    st.markdown("#### 🔑 API Key Usage")
+    st.dataframe(
+        usage[["Key", "Status", "Used (1h)", "Remaining"]],
+        column_config={
+            "Key": "🔑 Key",
+            "Status": "📡 Status",
+            "Used (1h)": "📈 Used",
+            "Remaining": "⏳ Left"
+        },
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption(f"{nasa_api.remaining_requests():,} requests left this hour across {len(nasa_api.key_pool)} key(s)")
+
 # ---------------------------
 # MAIN DASHBOARD LAYOUT
 # ---------------------------
 def main():
     # Create sidebar and get API key
-    api_key = create_sidebar()
+    with timed_section("Sidebar"):
+        api_key = create_sidebar()
     
-    # Initialize API manager with user's key
-    nasa_api = NASAApiManager(api_key)
+    # Initialize API manager with user's key(s); normalised so equivalent key lists share one pool
+    nasa_api = get_nasa_api(",".join(parse_api_keys(api_key)))
+    
+    # In progressive mode sections queue their fetches here and are filled in at the end.
+    # Profiled reruns fetch inline so the fetches show up in the profile.
+    progressive = st.session_state.get("progressive_mode", True) and not profiling_active()
+    pending = [] if progressive else None
     
     # Create header
-    create_space_header()
+    with timed_section("Header"):
+        create_space_header()
     
     # Quick stats at top
-    col_stats1, col_stats2, col_stats3, col_stats4 = st.columns(4)
-    with col_stats1:
-        st.metric("🌌 Active Missions", "42", "+2")
-    with col_stats2:
-        st.metric("🛰️ Satellites", "2,874", "↗️ 15")
-    with col_stats3:
-        st.metric("🪐 Planets Found", "5,632", "+48")
-    with col_stats4:
-        st.metric("⭐ Stars Mapped", "1.8B", "↗️ 0.2%")
+    with timed_section("Quick stats"):
+        col_stats1, col_stats2, col_stats3, col_stats4 = st.columns(4)
+        with col_stats1:
+            st.metric("🌌 Active Missions", "42", "+2")
+        with col_stats2:
+            st.metric("🛰️ Satellites", "2,874", "↗️ 15")
+        with col_stats3:
+            st.metric("🪐 Planets Found", "5,632", "+48")
+        with col_stats4:
+            st.metric("⭐ Stars Mapped", "1.8B", "↗️ 0.2%")
     
     # Main dashboard tabs
     tab1, tab2, tab3, tab4 = st.tabs([
@@ -885,7 +2662,8 @@ def main():
     ])
     
     with tab1:
-        create_apod_section(nasa_api)
+        with timed_section("APOD"):
+            create_apod_section(nasa_api, pending)
         
         col1, col2 = st.columns(2)
         with col1:
@@ -929,13 +2707,16 @@ def main():
             )
     
     with tab2:
-        create_neo_dashboard(nasa_api)
+        with timed_section("NEO tracker"):
+            create_neo_dashboard(nasa_api, pending)
+        with timed_section("NEO catalog"):
+            create_neo_catalog_section(nasa_api)
     
-    with tab3:
-        create_mars_section(nasa_api)
+    with tab3, timed_section("Mars & Earth"):
+        create_mars_section(nasa_api, pending)
     
-    with tab4:
-        create_space_weather(nasa_api)
+    with tab4, timed_section("Space weather"):
+        create_space_weather(nasa_api, pending)
     
     # Enhanced Footer
     st.markdown("---")
@@ -955,6 +2736,35 @@ def main():
         </div>
     </div>
     """, unsafe_allow_html=True)
+    
+    if pending:
+        resolve_pending_sections(pending)
+    
+    # Drawn last so it counts this run's requests
+    with st.sidebar:
+        render_key_usage(nasa_api)
+
+def run_app():
+    """Run the dashboard, profiling this rerun when an admin asked for it"""
+    token = _full_run.set(True)
+    try:
+        report = st.container()
+        profile = None
+        if profile_requested():
+            profile = profile_rerun(main)
+            if profile is None:
+                with report:
+                    st.warning("Another session is being profiled; this rerun was not profiled.")
+            else:
+                # Kept until closed, so the report's own widgets can rerun without losing it
+                st.session_state["profile_report"] = summarize_profile(profile)
+        if profile is None:
+            main()
+        if "profile_report" in st.session_state and is_admin():
+            with report:
+                render_profile_report(st.session_state["profile_report"])
+    finally:
+        _full_run.reset(token)
 
 if __name__ == "__main__":
-    main()
+    run_app()
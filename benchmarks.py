@@ -0,0 +1,176 @@
+"""Micro-benchmarks for the dashboard's numeric paths.
+
+Run from the project root:
+
+    python benchmarks.py propagator
+    python benchmarks.py parsing
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, timedelta
+
+# Importing the app outside `streamlit run` logs bare-mode warnings; keep output clean
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+import app  # noqa: E402
+
+
+def bench_propagator(args):
+    print(f"{'objects':>8} {'steps':>6} {'ms':>10} {'object-steps/s':>16}")
+    for n_objects in args.objects:
+        for n_steps in args.steps:
+            result = app.benchmark_propagator(n_objects, n_steps, repeats=args.repeats)
+            print(f"{n_objects:>8} {n_steps:>6} {result['seconds'] * 1000:>10.1f} {result['object_steps_per_second']:>16,.0f}")
+
+
+def make_feed_payload(days, per_day, seed=0):
+    """Synthetic NEO feed shaped like the real one, including every field we never read"""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    near_earth_objects = {}
+    for d in range(days):
+        day = (start + timedelta(days=d)).isoformat()
+        objects = []
+        for j in range(per_day):
+            neo_id = str(2000000 + d * per_day + j)
+            size = rng.uniform(5, 900)
+            km = rng.uniform(1e5, 7.5e7)
+            kps = rng.uniform(2, 35)
+            objects.append({
+                "links": {"self": f"http://api.nasa.gov/neo/rest/v1/neo/{neo_id}?api_key=DEMO_KEY"},
+                "id": neo_id,
+                "neo_reference_id": neo_id,
+                "name": f"({day[:4]} {rng.choice('ABCDEFGH')}{rng.choice('JKLMNOPQ')}{j})",
+                "nasa_jpl_url": f"https://ssd.jpl.nasa.gov/tools/sbdb_lookup.html#/?sstr={neo_id}",
+                "absolute_magnitude_h": rng.uniform(15, 30),
+                "estimated_diameter": {
+                    unit: {"estimated_diameter_min": size * 0.45 * factor, "estimated_diameter_max": size * factor}
+                    for unit, factor in (("kilometers", 1e-3), ("meters", 1.0), ("miles", 6.2e-4), ("feet", 3.28))
+                },
+                "is_potentially_hazardous_asteroid": rng.random() > 0.9,
+                "close_approach_data": [{
+                    "close_approach_date": day,
+                    "close_approach_date_full": f"{day} 12:34",
+                    "epoch_date_close_approach": 1735734840000,
+                    "relative_velocity": {
+                        "kilometers_per_second": str(kps),
+                        "kilometers_per_hour": str(kps * 3600),
+                        "miles_per_hour": str(kps * 2237),
+                    },
+                    "miss_distance": {
+                        "astronomical": str(km / 1.496e8),
+                        "lunar": str(km / 384400),
+                        "kilometers": str(km),
+                        "miles": str(km * 0.621),
+                    },
+                    "orbiting_body": "Earth",
+                }],
+                "is_sentry_object": False,
+            })
+        near_earth_objects[day] = objects
+    return {
+        "links": {"next": "", "previous": "", "self": ""},
+        "element_count": days * per_day,
+        "near_earth_objects": near_earth_objects,
+    }
+
+
+def _rss_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+
+def _reset_peak_rss():
+    """Reset VmHWM so the peak covers only the parse, not importing the app (Linux)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _parse_child(path, mode):
+    """Run one parse in this (fresh) process and report time and peak RSS as JSON"""
+    if _reset_peak_rss():
+        baseline_kb = _rss_kb("VmRSS")
+        peak = lambda: _rss_kb("VmHWM")
+    else:
+        baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        if mode == "stream":
+            columns = app.parse_neo_feed_stream(f, app.new_neo_columns())
+        else:
+            # What response.json() does: read the whole body, build the tree, then pick fields
+            columns = app.project_neo_feed(json.loads(f.read()), app.new_neo_columns())
+    elapsed = time.perf_counter() - start
+    peak_kb = peak()
+    print(json.dumps({"rows": len(columns["id"]), "seconds": elapsed, "peak_mb": peak_kb / 1024, "delta_mb": (peak_kb - baseline_kb) / 1024}))
+
+
+def bench_parsing(args):
+    if app.ijson is None:
+        sys.exit("ijson is not installed; the streaming path is unavailable")
+    print(f"{'days':>5} {'objects':>8} {'MB':>7} {'path':>7} {'ms':>9} {'peak RSS MB':>12} {'RSS growth MB':>14}  app uses")
+    for days in args.days:
+        payload = json.dumps(make_feed_payload(days, args.per_day)).encode()
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+            f.write(payload)
+        # What read_neo_feed_response picks for this body; the threshold is on uncompressed JSON
+        used = "stream" if len(payload) >= app.NEO_FEED_STREAM_MIN_BYTES else "full"
+        try:
+            for mode in ("full", "stream"):
+                runs = []
+                for _ in range(args.repeats):
+                    out = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), "_parse_child", f.name, mode],
+                        capture_output=True, text=True, check=True,
+                    )
+                    runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+                best = min(runs, key=lambda r: r["seconds"])
+                print(f"{days:>5} {best['rows']:>8} {len(payload) / 1e6:>7.1f} {mode:>7} {best['seconds'] * 1000:>9.1f} "
+                      f"{best['peak_mb']:>12.1f} {best['delta_mb']:>14.1f}  {'*' if mode == used else ''}")
+        finally:
+            os.remove(f.name)
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "_parse_child":
+        return _parse_child(sys.argv[2], sys.argv[3])
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    prop = sub.add_parser("propagator", help="Keplerian orbit propagation throughput")
+    prop.add_argument("--objects", type=int, nargs="+", default=[100, 1000, 10000])
+    prop.add_argument("--steps", type=int, nargs="+", default=[60, 365])
+    prop.add_argument("--repeats", type=int, default=3)
+    prop.set_defaults(func=bench_propagator)
+
+    parse = sub.add_parser("parsing", help="NEO feed parse time and peak RSS: full json vs streaming")
+    # The app fetches the feed in windows of at most NEO_FEED_MAX_DAYS + 1 days
+    parse.add_argument("--days", type=int, nargs="+", default=[1, 4, app.NEO_FEED_MAX_DAYS + 1])
+    parse.add_argument("--per-day", type=int, default=25, help="Objects per feed day (real feeds carry about 10-30)")
+    parse.add_argument("--repeats", type=int, default=3)
+    parse.set_defaults(func=bench_parsing)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Image work for the EPIC Earth time-lapse.
+
+Kept out of app.py because decode_frame runs in worker processes, which must be
+able to import it by module name; the Streamlit script itself is not importable
+that way.
+"""
+import io
+from typing import List
+
+from PIL import Image
+
+
+def decode_frame(data: bytes, size: int) -> bytes:
+    """Decode one EPIC image and return it as raw RGB bytes, resized to size x size"""
+    with Image.open(io.BytesIO(data)) as image:
+        frame = image.convert("RGB").resize((size, size), Image.LANCZOS)
+        return frame.tobytes()
+
+
+def encode_gif(frames: List[bytes], size: int, path: str, frame_ms: int = 120):
+    """Encode raw RGB frames as a looping animated GIF"""
+    images = [Image.frombytes("RGB", (size, size), frame) for frame in frames]
+    images[0].save(
+        path,
+        format="GIF",
+        save_all=True,
+        append_images=images[1:],
+        duration=frame_ms,
+        loop=0,
+        optimize=True,
+    )
@@ -0,0 +1,46 @@
+"""Download the full NEO catalog into ./neo_catalog for the dashboard to search.
+
+Safe to interrupt: pages already on disk are skipped when the command is re-run.
+
+    python ingest_catalog.py --api-key YOUR_KEY --workers 4
+
+Pass several keys (or set NASA_API_KEYS=key1,key2) to spread requests across
+their hourly budgets.
+"""
+import argparse
+import logging
+import os
+import warnings
+
+# Importing the app outside `streamlit run` logs bare-mode warnings; keep output clean
+logging.disable(logging.WARNING)
+warnings.filterwarnings("ignore")
+
+import app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--api-key", nargs="+",
+                        default=[os.environ.get("NASA_API_KEYS") or os.environ.get("NASA_API_KEY", "DEMO_KEY")],
+                        help="One or more API keys; requests are spread across them")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pages", type=int, default=None, help="Stop after this many pages")
+    parser.add_argument("--catalog-dir", default=app.NEO_CATALOG_DIR)
+    args = parser.parse_args()
+
+    ingester = app.NEOCatalogIngester(app.NASAApiManager(args.api_key), args.catalog_dir, workers=args.workers)
+    try:
+        written = ingester.run(max_pages=args.max_pages)
+    except KeyboardInterrupt:
+        print("Interrupted; re-run to resume.")
+        return
+    status = ingester.status()
+    for usage in ingester.nasa_api.key_pool.usage():
+        print(f"  {usage['Key']}: {usage['Status']}, {usage['Used (1h)']} used, {usage['Remaining']} left this hour")
+    print(f"Wrote {written} pages ({status['pages_failed']} failed). "
+          f"{status['pages_done']}/{status['total_pages'] or '?'} pages on disk -> {ingester.catalog_path}")
+
+
+if __name__ == "__main__":
+    main()